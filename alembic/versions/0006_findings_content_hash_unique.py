@@ -0,0 +1,51 @@
+"""Make findings.content_hash unique for ON CONFLICT upserts
+
+Revision ID: 0006
+Revises: 0005
+"""
+from alembic import op
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Fold any duplicates left by the old SELECT-then-INSERT race into the
+    # earliest row before the unique index can be built.
+    op.execute(
+        """
+        WITH grouped AS (
+            SELECT
+                id,
+                row_number() OVER w AS rn,
+                sum(sighting_count) OVER (PARTITION BY content_hash) AS total,
+                max(last_seen) OVER (PARTITION BY content_hash) AS latest,
+                max(confidence) OVER (PARTITION BY content_hash) AS best
+            FROM findings
+            WINDOW w AS (PARTITION BY content_hash ORDER BY first_seen, id)
+        )
+        UPDATE findings f
+        SET sighting_count = g.total, last_seen = g.latest, confidence = g.best
+        FROM grouped g
+        WHERE f.id = g.id AND g.rn = 1 AND g.total > f.sighting_count
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM findings f
+        USING (
+            SELECT id, row_number() OVER (PARTITION BY content_hash ORDER BY first_seen, id) AS rn
+            FROM findings
+        ) d
+        WHERE f.id = d.id AND d.rn > 1
+        """
+    )
+    op.drop_index("ix_findings_content_hash", table_name="findings")
+    op.create_index("ix_findings_content_hash", "findings", ["content_hash"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_findings_content_hash", table_name="findings")
+    op.create_index("ix_findings_content_hash", "findings", ["content_hash"])
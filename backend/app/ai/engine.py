@@ -129,7 +129,7 @@ async def analyze_hunt_results(
     if ctx is None:
         raise RuntimeError(f"Session {session_id} not found")
 
-    async with ctx.ai_lock:
+    async with ctx.guard("ai"):
         return await _run_analysis(session_id, hunt_id, module, observations, db)
 
 
@@ -287,14 +287,27 @@ async def _run_analysis(
     findings_count = 0
     asset_id = session_manager.get(session_id).asset_id if session_manager.get(session_id) else None
 
-    for ai_finding in result.findings:
-        finding_id = await _persist_finding(
+    # Persist concurrently so finding_upserter writes them as one batch; one bad
+    # finding must not take the rest (or their timeline events) down with it
+    finding_ids = await asyncio.gather(*(
+        _persist_finding(
             session_id=session_id,
             hunt_id=hunt_id,
             asset_id=asset_id,
             ai_finding=ai_finding,
             db=db,
         )
+        for ai_finding in result.findings
+    ), return_exceptions=True)
+
+    ctx = session_manager.get(session_id)
+    analyst_id = ctx.analyst_id if ctx else "system"
+    timeline_events: list[dict] = []
+
+    for ai_finding, finding_id in zip(result.findings, finding_ids):
+        if isinstance(finding_id, BaseException):
+            logger.error("Failed to persist finding %r: %s", ai_finding.title, finding_id)
+            continue
         if finding_id:
             findings_count += 1
             await emit_event(
@@ -307,26 +320,26 @@ async def _run_analysis(
                 )
             )
 
-            # Record timeline event for finding
             if asset_id:
-                try:
-                    from app.intelligence.timeline.recorder import record_timeline_event
-                    ctx = session_manager.get(session_id)
-                    analyst_id = ctx.analyst_id if ctx else "system"
-                    await record_timeline_event(
-                        asset_id=asset_id,
-                        event_type="finding.generated",
-                        analyst_id=analyst_id,
-                        payload={
-                            "finding_id": finding_id,
-                            "title": ai_finding.title,
-                            "severity": ai_finding.severity,
-                        },
-                        session_id=session_id,
-                        db=db,
-                    )
-                except Exception as tl_exc:
-                    logger.warning("Timeline record failed for finding: %s", tl_exc)
+                timeline_events.append({
+                    "asset_id": asset_id,
+                    "event_type": "finding.generated",
+                    "analyst_id": analyst_id,
+                    "payload": {
+                        "finding_id": finding_id,
+                        "title": ai_finding.title,
+                        "severity": ai_finding.severity,
+                    },
+                    "session_id": session_id,
+                })
+
+    # Record timeline events for all findings in one round trip
+    if timeline_events:
+        try:
+            from app.intelligence.timeline.recorder import record_timeline_events_bulk
+            await record_timeline_events_bulk(timeline_events, db)
+        except Exception as tl_exc:
+            logger.warning("Timeline record failed for findings: %s", tl_exc)
 
     return findings_count
 
@@ -5,7 +5,7 @@ from pydantic import BaseModel
 from sqlalchemy import select
 
 from app.core.db.models import User, UserRole
-from app.core.security.auth import hash_password
+from app.core.security.auth import ahash_password, invalidate_user_status
 from .deps import AdminUser, DbDep
 
 router = APIRouter(prefix="/admin", tags=["admin"])
@@ -43,7 +43,7 @@ async def admin_register_user(
 
     user = User(
         username=body.username,
-        password_hash=hash_password(body.password),
+        password_hash=await ahash_password(body.password),
         role=role,
         is_active=True,
     )
@@ -85,4 +85,7 @@ async def deactivate_user(user_id: str, db: DbDep, admin: AdminUser):
         raise HTTPException(status_code=400, detail="Cannot deactivate yourself")
     user.is_active = False
     await db.flush()
+    # Commit before invalidating, or a refresh in between re-caches the old row
+    await db.commit()
+    invalidate_user_status(user.username)
     return {"ok": True}
@@ -38,6 +38,9 @@ class Settings(BaseSettings):
     virustotal_mcp_url: str = "https://www.virustotal.com/api/v3"
     shodan_mcp_url: str = "https://api.shodan.io"
     abuseipdb_mcp_url: str = "https://api.abuseipdb.com/api/v2"
+    mcp_max_concurrency: int = 4         # in-flight lookups per provider
+    mcp_cache_ttl: int = 3600            # seconds to reuse a successful lookup
+    mcp_error_cache_ttl: int = 30        # seconds to reuse a failed lookup
 
     # CORS
     cors_origins: str = "http://localhost:5173,http://localhost:3000"
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from collections.abc import AsyncGenerator
 
+import orjson
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -10,12 +11,19 @@ from sqlalchemy.ext.asyncio import (
 
 from app.config import settings
 
+
+def _json_serializer(obj) -> str:
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 engine = create_async_engine(
     settings.database_url,
     pool_size=5,
     max_overflow=15,
     pool_pre_ping=True,
     echo=settings.app_env == "development",
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
 )
 
 AsyncSessionLocal = async_sessionmaker(
@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+import functools
+import uuid
+
+
+@functools.lru_cache(maxsize=2048)
+def as_uuid(value: uuid.UUID | str) -> uuid.UUID:
+    """Parse an ID string to UUID, memoised since the same session/asset IDs recur."""
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(value)
@@ -154,7 +154,7 @@ class Finding(Base):
     title: Mapped[str] = mapped_column(String(512), nullable=False)
     severity: Mapped[Severity] = mapped_column(Enum(Severity), nullable=False)
     confidence: Mapped[float] = mapped_column(Float, nullable=False)
-    content_hash: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False, unique=True, index=True)
     stix_bundle: Mapped[dict | None] = mapped_column(JSONB)
     first_seen: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     last_seen: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -42,7 +42,8 @@ class EventBus:
                 pass
 
         try:
-            await asyncio.wait_for(self._queue.put(event), timeout=0.1)
+            async with asyncio.timeout(0.1):
+                await self._queue.put(event)
         except asyncio.TimeoutError:
             logger.warning("Event bus full — dropping event: %s", event.event_type)
 
@@ -11,38 +11,106 @@ logger = logging.getLogger(__name__)
 # Injected at startup from transport/socketio.py to avoid circular imports
 _sio = None
 
+# Bound on queued outbound events. When it is full, emitters wait for the flush task
+# (backpressure, nothing is dropped). sio.emit only hands packets to engineio's
+# per-client queues, so a full queue means the event loop is behind, not that a
+# slow client is stalling producers.
+EMIT_QUEUE_MAXSIZE = 1024
+EMIT_SHUTDOWN_TIMEOUT = 5.0  # seconds to let queued events go out at shutdown
+
+# Outbound (event_type, payload, room), created by start_emitter() on the running loop
+_outbound: asyncio.Queue[tuple[str, dict, str]] | None = None
+_flush_task: asyncio.Task | None = None
+
 
 def init_emitter(sio) -> None:
     global _sio
     _sio = sio
 
 
+def start_emitter() -> None:
+    """Create the outbound queue and its flush task. Called from the app startup hook."""
+    global _outbound, _flush_task
+    _outbound = asyncio.Queue(maxsize=EMIT_QUEUE_MAXSIZE)
+    _flush_task = asyncio.get_running_loop().create_task(_flush_outbound(_outbound), name="sio-emit")
+
+
+async def _queue_emit(event: BaseEvent, room: str) -> None:
+    """
+    Queue an event for Socket.IO; it is sent with everything else queued in the same
+    loop tick. Returns once queued, not once delivered. Before start_emitter() runs
+    the event is sent directly.
+    """
+    try:
+        payload = event.to_payload()
+    except Exception as exc:
+        logger.error("Socket.IO payload build failed for %s: %s", event.event_type, exc)
+        return
+    if _outbound is None:
+        await _emit_room(room, [(event.event_type, payload)])
+        return
+    await _outbound.put((event.event_type, payload, room))
+
+
+async def _flush_outbound(outbound: asyncio.Queue[tuple[str, dict, str]]) -> None:
+    while True:
+        batch = [await outbound.get()]
+        while True:
+            try:
+                batch.append(outbound.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+
+        by_room: dict[str, list[tuple[str, dict]]] = {}
+        for event_type, payload, room in batch:
+            by_room.setdefault(room, []).append((event_type, payload))
+        try:
+            await asyncio.gather(*(_emit_room(room, items) for room, items in by_room.items()))
+        finally:
+            for _ in batch:
+                outbound.task_done()
+
+
+async def _emit_room(room: str, items: list[tuple[str, dict]]) -> None:
+    """Send one room's events back-to-back, in emit order."""
+    for event_type, payload in items:
+        try:
+            await _sio.emit(event_type, payload, room=room)
+        except Exception as exc:
+            logger.error("Socket.IO emit failed for %s: %s", event_type, exc)
+
+
+async def close_emitter() -> None:
+    """Send queued events (bounded by EMIT_SHUTDOWN_TIMEOUT), then stop the flush task."""
+    global _outbound, _flush_task
+    if _flush_task is None:
+        return
+    try:
+        async with asyncio.timeout(EMIT_SHUTDOWN_TIMEOUT):
+            await _outbound.join()
+    except asyncio.TimeoutError:
+        logger.warning("Dropping %d unsent Socket.IO event(s) at shutdown", _outbound.qsize())
+    _flush_task.cancel()
+    try:
+        await _flush_task
+    except asyncio.CancelledError:
+        pass
+    _outbound = None
+    _flush_task = None
+
+
 async def emit_event(event: BaseEvent) -> None:
-    """Put event on bus and emit to Socket.IO room."""
+    """Put event on bus and queue it for the Socket.IO room."""
     await event_bus.put(event, session_id=event.session_id)
     if _sio is not None and event.session_id:
-        try:
-            await _sio.emit(
-                event.event_type,
-                event.model_dump(mode="json"),
-                room=event.session_id,
-            )
-        except Exception as exc:
-            logger.error("Socket.IO emit failed for %s: %s", event.event_type, exc)
+        await _queue_emit(event, event.session_id)
 
 
 async def emit_to_session(event: BaseEvent, session_id: str | None = None) -> None:
     """Emit to a specific session room (overrides event.session_id for routing)."""
     target = session_id or event.session_id
     if _sio is not None and target:
-        try:
-            await _sio.emit(
-                event.event_type,
-                event.model_dump(mode="json"),
-                room=target,
-            )
-        except Exception as exc:
-            logger.error("Socket.IO targeted emit failed: %s", exc)
+        await _queue_emit(event, target)
 
 
 async def bus_drain_loop() -> None:
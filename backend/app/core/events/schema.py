@@ -18,6 +18,10 @@ class BaseEvent(BaseModel):
     session_id: str | None = None
     timestamp: datetime = Field(default_factory=_now)
 
+    def to_payload(self) -> dict:
+        """Socket.IO payload for this event."""
+        return self.model_dump(mode="json")
+
 
 # ── Session Lifecycle ─────────────────────────────────────────────────────────
 
@@ -123,7 +127,13 @@ class TerminalStarted(BaseEvent):
 class TerminalData(BaseEvent):
     event_type: Literal["terminal.data"] = "terminal.data"
     session_id: str
-    data: str  # base64-encoded raw ANSI bytes
+    data: bytes  # raw ANSI bytes, sent as a Socket.IO binary attachment
+
+    def to_payload(self) -> dict:
+        # Keep data as bytes; JSON mode would force it through a UTF-8 string
+        payload = self.model_dump(mode="json", exclude={"data"})
+        payload["data"] = self.data
+        return payload
 
 
 class TerminalResize(BaseEvent):
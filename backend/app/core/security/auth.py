@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import os
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
+from cachetools import TTLCache
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
@@ -11,8 +17,22 @@ from app.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt releases the GIL, so a thread pool keeps hashing off the event loop
+_pw_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="pwhash")
+
 ALGORITHM = "HS256"
 
+USER_STATUS_TTL = 60  # seconds a cached (is_active, role) is trusted on token refresh
+
+_user_status: TTLCache[str, tuple[bool, str]] = TTLCache(maxsize=10_000, ttl=USER_STATUS_TTL)
+
+ACCESS_TOKEN_CACHE_TTL = 30  # seconds a verified access token is reused without re-checking
+
+# blake2b(token) -> (payload, exp); only successful verifications are stored
+_verified_tokens: TTLCache[bytes, tuple[dict[str, Any], float]] = TTLCache(
+    maxsize=10_000, ttl=ACCESS_TOKEN_CACHE_TTL,
+)
+
 
 # ── Password ──────────────────────────────────────────────────────────────────
 
@@ -24,6 +44,14 @@ def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
 
+async def ahash_password(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(_pw_pool, hash_password, password)
+
+
+async def averify_password(plain: str, hashed: str) -> bool:
+    return await asyncio.get_running_loop().run_in_executor(_pw_pool, verify_password, plain, hashed)
+
+
 # ── Tokens ────────────────────────────────────────────────────────────────────
 
 def _create_token(subject: str, role: str, token_type: str, expires_delta: timedelta) -> str:
@@ -67,8 +95,42 @@ def verify_access_token(token: str) -> dict[str, Any]:
     return payload
 
 
+def verify_access_token_cached(token: str) -> dict[str, Any]:
+    """
+    verify_access_token with a short-lived cache, for Socket.IO reconnect storms
+    that present the same token repeatedly. Entries never outlive the token's exp.
+    """
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    hit = _verified_tokens.get(key)
+    if hit is not None:
+        payload, exp = hit
+        if exp > time.time():
+            return payload
+        _verified_tokens.pop(key, None)
+
+    payload = verify_access_token(token)
+    _verified_tokens[key] = (payload, float(payload.get("exp", 0)))
+    return payload
+
+
 def verify_refresh_token(token: str) -> dict[str, Any]:
     payload = verify_token(token)
     if payload.get("type") != "refresh":
         raise ValueError("Token is not a refresh token")
     return payload
+
+
+# ── User status cache ─────────────────────────────────────────────────────────
+
+def get_cached_user_status(username: str) -> tuple[bool, str] | None:
+    """Return the cached (is_active, role) for username, or None on a miss."""
+    return _user_status.get(username)
+
+
+def cache_user_status(username: str, is_active: bool, role: str) -> None:
+    _user_status[username] = (is_active, role)
+
+
+def invalidate_user_status(username: str) -> None:
+    """Drop a cached entry; call whenever a user's account or credentials change."""
+    _user_status.pop(username, None)
@@ -114,7 +114,8 @@ def _command_hash(command: str) -> str:
 def classify_command(command: str) -> tuple[CommandClass, str]:
     """
     Returns (CommandClass, reason).
-    Result is cached by command hash (via lru_cache on the string itself).
+    Memoised on the exact command string; call classify_command.cache_clear()
+    if the pattern lists are ever changed at runtime.
     """
     stripped = command.strip()
 
@@ -3,6 +3,8 @@ from __future__ import annotations
 import asyncio
 import logging
 import uuid
+from collections import Counter
+from datetime import datetime, timezone
 from typing import Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -21,6 +23,10 @@ from .state import validate_transition, InvalidTransitionError
 
 logger = logging.getLogger(__name__)
 
+# A DISCONNECTED session is left alone this long so the SSH engine's reconnect
+# loop (three attempts: 2 + 4 + 8 s of backoff plus up to 30 s per connect) can finish
+DISCONNECT_REAP_GRACE = 120  # seconds
+
 
 class SessionManager:
     """
@@ -32,6 +38,8 @@ class SessionManager:
         self._sessions: dict[str, SessionContext] = {}
         self._semaphore = asyncio.Semaphore(settings.max_sessions)
         self._lock = asyncio.Lock()
+        self._state_counts: Counter[str] = Counter()  # live sessions per state
+        self._reap_hint = asyncio.Event()  # set when a session becomes reapable
 
     @property
     def active_count(self) -> int:
@@ -43,6 +51,10 @@ class SessionManager:
     def get_all(self) -> list[SessionContext]:
         return list(self._sessions.values())
 
+    def get_state_counts(self) -> dict[str, int]:
+        """Live session count per state, maintained on create/transition/cleanup."""
+        return {state: n for state, n in self._state_counts.items() if n}
+
     async def create_session(
         self,
         asset_id: str,
@@ -74,6 +86,7 @@ class SessionManager:
 
         async with self._lock:
             self._sessions[session_id] = ctx
+            self._state_counts[ctx.state] += 1
 
         await emit_event(
             SessionCreated(
@@ -126,6 +139,12 @@ class SessionManager:
             raise
 
         ctx.state = to_state
+        if to_state_enum is SessionState.DISCONNECTED:
+            ctx.disconnected_at = datetime.now(timezone.utc)
+        elif to_state_enum is SessionState.CONNECTED:
+            ctx.disconnected_at = None
+        self._state_counts[from_state.value] -= 1
+        self._state_counts[to_state_enum.value] += 1
         logger.info("Session %s: %s → %s (%s)", session_id, from_state_str, to_state, reason)
 
         if db is not None:
@@ -148,10 +167,15 @@ class SessionManager:
 
         if to_state in (SessionState.TERMINATED, SessionState.FAILED):
             await self._cleanup_session(session_id)
+        elif to_state_enum is SessionState.DISCONNECTED:
+            # Wake the reaper once the reconnect window has run out
+            asyncio.get_running_loop().call_later(DISCONNECT_REAP_GRACE + 1, self._reap_hint.set)
 
     async def _cleanup_session(self, session_id: str) -> None:
         async with self._lock:
             ctx = self._sessions.pop(session_id, None)
+            if ctx is not None:
+                self._state_counts[SessionState(ctx.state).value] -= 1
 
         if ctx is not None:
             self._semaphore.release()
@@ -173,15 +197,32 @@ class SessionManager:
             except Exception as exc:
                 logger.warning("Error cleaning up session %s during shutdown: %s", session_id, exc)
 
+    async def wait_for_reap_hint(self, timeout: float) -> None:
+        """Block until a disconnected session outlasts its reconnect window or timeout elapses."""
+        try:
+            async with asyncio.timeout(timeout):
+                await self._reap_hint.wait()
+        except asyncio.TimeoutError:
+            pass
+        self._reap_hint.clear()
+
     async def reap_stale_sessions(self, max_age_seconds: int = 3600) -> int:
-        """Remove sessions that have been in non-terminal states too long without activity."""
-        from datetime import datetime, timezone
+        """
+        Remove DISCONNECTED/FAILED sessions that can no longer recover: those disconnected
+        for longer than DISCONNECT_REAP_GRACE, or older than max_age_seconds if no
+        disconnect time was recorded.
+        """
         now = datetime.now(timezone.utc)
         reaped = 0
 
         for session_id, ctx in list(self._sessions.items()):
-            age = (now - ctx.created_at).total_seconds()
-            if age > max_age_seconds and ctx.state in ("DISCONNECTED", "FAILED"):
+            if ctx.state not in ("DISCONNECTED", "FAILED"):
+                continue
+            if ctx.disconnected_at is not None:
+                stale = (now - ctx.disconnected_at).total_seconds() > DISCONNECT_REAP_GRACE
+            else:
+                stale = (now - ctx.created_at).total_seconds() > max_age_seconds
+            if stale:
                 try:
                     await self._cleanup_session(session_id)
                     reaped += 1
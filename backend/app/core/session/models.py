@@ -2,9 +2,19 @@ from __future__ import annotations
 
 import asyncio
 import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
+# Lock kinds accepted by SessionContext.lock()/guard() -> lock field name
+_LOCK_ATTRS: dict[str, str] = {
+    "command": "command_lock",
+    "ai": "ai_lock",
+    "mode": "mode_mutex",
+    "toggle": "toggle_lock",
+}
+
 
 @dataclass
 class SessionContext:
@@ -17,14 +27,38 @@ class SessionContext:
     mode: str = "ai"
     locked_by: str | None = None
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    # When the session last entered DISCONNECTED; cleared once it reconnects
+    disconnected_at: datetime | None = None
 
-    # Runtime locks (not serialized)
-    command_lock: asyncio.Lock = field(default_factory=asyncio.Lock, compare=False, repr=False)
-    ai_lock: asyncio.Lock = field(default_factory=asyncio.Lock, compare=False, repr=False)
-    mode_mutex: asyncio.Lock = field(default_factory=asyncio.Lock, compare=False, repr=False)
+    # Runtime locks, allocated by lock() on first use; most sessions never touch all four
+    command_lock: asyncio.Lock | None = field(default=None, compare=False, repr=False)
+    ai_lock: asyncio.Lock | None = field(default=None, compare=False, repr=False)
+    mode_mutex: asyncio.Lock | None = field(default=None, compare=False, repr=False)
+    toggle_lock: asyncio.Lock | None = field(default=None, compare=False, repr=False)
 
     # SSH connection handle (injected by SSH engine)
     ssh_connection: object | None = field(default=None, compare=False, repr=False)
+    # Keystroke writer for the open PTY (set by the PTY session while interactive)
+    pty_input: object | None = field(default=None, compare=False, repr=False)
+    pty_task: asyncio.Task | None = field(default=None, compare=False, repr=False)
+    # Latest requested terminal size and the pending debounced resize
+    resize_target: tuple[int, int] | None = field(default=None, compare=False, repr=False)
+    resize_handle: asyncio.TimerHandle | None = field(default=None, compare=False, repr=False)
+
+    def lock(self, kind: str) -> asyncio.Lock:
+        """Return the lock guarding `kind`, allocating it on first use. Unknown kinds raise KeyError."""
+        attr = _LOCK_ATTRS[kind]
+        lock = getattr(self, attr)
+        if lock is None:
+            lock = asyncio.Lock()
+            setattr(self, attr, lock)
+        return lock
+
+    @asynccontextmanager
+    async def guard(self, kind: str) -> AsyncIterator[None]:
+        """Hold the `kind` critical section. Different kinds do not block each other."""
+        async with self.lock(kind):
+            yield
 
     def to_dict(self) -> dict:
         return {
@@ -36,15 +36,25 @@ _DESTROY_ALLOWED = {
     SessionState.DISCONNECTED,
 }
 
+# SessionState is a str enum, so give each state a bit position and encode
+# the allowed targets of every from-state as a single int bitmask.
+_STATE_BIT: dict[SessionState, int] = {state: idx for idx, state in enumerate(SessionState)}
+
+_ALLOWED_MASK: list[int] = [0] * len(SessionState)
+for _frm, _tos in _TRANSITIONS.items():
+    _ALLOWED_MASK[_STATE_BIT[_frm]] = sum(1 << _STATE_BIT[t] for t in _tos)
+
+_DESTROY_MASK: int = sum(1 << _STATE_BIT[s] for s in _DESTROY_ALLOWED)
+
 
 def validate_transition(from_state: SessionState, to_state: SessionState) -> None:
     """
     Raise InvalidTransitionError if the transition is not allowed.
     """
-    if to_state == SessionState.TERMINATED and from_state in _DESTROY_ALLOWED:
+    frm = _STATE_BIT[from_state]
+    if to_state is SessionState.TERMINATED and (_DESTROY_MASK >> frm) & 1:
         return
-    allowed = _TRANSITIONS.get(from_state, set())
-    if to_state not in allowed:
+    if not (_ALLOWED_MASK[frm] >> _STATE_BIT[to_state]) & 1:
         raise InvalidTransitionError(
             f"Invalid session state transition: {from_state} → {to_state}"
         )
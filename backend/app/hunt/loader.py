@@ -13,8 +13,12 @@ logger = logging.getLogger(__name__)
 
 HUNT_MODULES_PATH = os.environ.get("HUNT_MODULES_PATH", str(Path(__file__).parent.parent.parent.parent / "hunt_modules"))
 
-# Regex to detect shell metacharacters in step command definitions
-_SHELL_META = re.compile(r"[;&|`$(){}!]")
+# Shell metacharacters in step command definitions. A set-disjointness test
+# scans the command in C and lets clean commands skip the regex checks.
+_META_CHARS = frozenset(";&|`$(){}!")
+
+# Fallback for step attribute lines the str.partition fast path rejects
+_ATTR_RE = re.compile(r"\*\*(\w+)\*\*:\s*(.*)")
 
 
 def _parse_frontmatter(content: str) -> tuple[dict, str]:
@@ -51,12 +55,17 @@ def _parse_steps(body: str) -> list[HuntStep]:
         attrs: dict = {}
 
         for line in lines[1:]:
-            m = re.match(r"\*\*(\w+)\*\*:\s*(.*)", line.strip())
-            if m:
-                key, val = m.group(1).lower(), m.group(2).strip()
-                # Strip backtick code spans
-                val = val.strip("`").strip()
-                attrs[key] = val
+            s = line.strip()
+            if not s.startswith("**"):
+                continue
+            key, sep, val = s[2:].partition("**:")
+            if not sep or not key.replace("_", "").isalnum():
+                m = _ATTR_RE.match(s)
+                if not m:
+                    continue
+                key, val = m.group(1), m.group(2)
+            # Strip backtick code spans
+            attrs[key.lower()] = val.strip().strip("`").strip()
 
         command = attrs.get("command", "")
         if not command:
@@ -64,7 +73,7 @@ def _parse_steps(body: str) -> list[HuntStep]:
             continue
 
         # Validate: no shell metacharacters in step definition
-        if _SHELL_META.search(command) and not _is_safe_shell_construct(command):
+        if not _META_CHARS.isdisjoint(command) and not _is_safe_shell_construct(command):
             logger.warning("Hunt step %s command contains potential metacharacters: %s", step_id, command)
 
         try:
@@ -131,8 +140,7 @@ class HuntModuleRegistry:
     def __init__(self) -> None:
         self._modules: dict[str, HuntModule] = {}
         self._directory: str = HUNT_MODULES_PATH
-        self._dir_mtime: float = 0.0
-        self._file_mtimes: dict[str, float] = {}
+        self._digest: tuple[int, int] | None = None
 
     def load_all(self, directory: str | None = None) -> None:
         self._directory = directory or HUNT_MODULES_PATH
@@ -145,46 +153,34 @@ class HuntModuleRegistry:
             return
 
         self._modules.clear()
-        self._file_mtimes.clear()
         for md_file in sorted(path.glob("*.md")):
             module = load_module(md_file)
             if module:
                 self._modules[module.id] = module
-                self._file_mtimes[str(md_file)] = md_file.stat().st_mtime
 
-        self._dir_mtime = path.stat().st_mtime
+        self._digest = self._scan_digest()
         logger.info("Hunt module registry loaded: %d modules", len(self._modules))
 
-    def _check_reload(self) -> None:
-        """Auto-reload when directory contents or files have changed on disk."""
-        path = Path(self._directory)
-        if not path.exists():
-            return
-
-        # Fast check: directory mtime changes when files are added/removed/renamed
+    def _scan_digest(self) -> tuple[int, int] | None:
+        """(file count, sum of mtimes in ns) over *.md files, from one directory scan."""
         try:
-            current_dir_mtime = path.stat().st_mtime
+            with os.scandir(self._directory) as entries:
+                mtimes = [
+                    e.stat().st_mtime_ns
+                    for e in entries
+                    if e.name.endswith(".md") and e.is_file()
+                ]
         except OSError:
-            return
+            return None
+        return len(mtimes), sum(mtimes)
 
-        if current_dir_mtime != self._dir_mtime:
-            logger.info("Hunt modules directory changed — reloading")
-            self._do_load()
+    def _check_reload(self) -> None:
+        """Auto-reload when files have been added, removed or edited on disk."""
+        digest = self._scan_digest()
+        if digest is None or digest == self._digest:
             return
-
-        # Slower check: individual file mtimes for in-place edits
-        for filepath, mtime in self._file_mtimes.items():
-            try:
-                if Path(filepath).stat().st_mtime != mtime:
-                    logger.info("Hunt module file changed (%s) — reloading", filepath)
-                    self._do_load()
-                    return
-            except OSError:
-                # File deleted — directory mtime should have caught this,
-                # but reload to be safe
-                logger.info("Hunt module file removed (%s) — reloading", filepath)
-                self._do_load()
-                return
+        logger.info("Hunt modules directory changed — reloading")
+        self._do_load()
 
     def get(self, module_id: str) -> HuntModule | None:
         self._check_reload()
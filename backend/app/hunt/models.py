@@ -21,3 +21,33 @@ class HuntModule:
     tags: list[str]
     severity_hint: str
     steps: list[HuntStep] = field(default_factory=list)
+
+
+@dataclass
+class Observation:
+    """Result of running one hunt step; serialized with to_dict()."""
+    step_id: str
+    command: str
+    stdout: str = ""
+    stderr: str = ""
+    exit_code: int = -1
+    truncated: bool = False
+    error: str | None = None
+
+    def to_dict(self) -> dict:
+        """Wire/JSON shape: failed steps carry only the error, successful ones only output."""
+        if self.error is not None:
+            return {
+                "step_id": self.step_id,
+                "command": self.command,
+                "error": self.error,
+                "exit_code": self.exit_code,
+            }
+        return {
+            "step_id": self.step_id,
+            "command": self.command,
+            "stdout": self.stdout,
+            "stderr": self.stderr,
+            "exit_code": self.exit_code,
+            "truncated": self.truncated,
+        }
@@ -10,6 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.db.models import HuntExecution, HuntState
 from app.core.events.emitter import emit_event
 from app.core.events.schema import (
+    BaseEvent,
     HuntCancelled,
     HuntCompleted,
     HuntFailed,
@@ -21,10 +22,39 @@ from app.core.events.schema import (
 from app.core.session.manager import session_manager
 from app.ssh.executor import execute_command
 from .loader import module_registry
-from .models import HuntModule, HuntStep
+from .models import HuntModule, HuntStep, Observation
 
 logger = logging.getLogger(__name__)
 
+# Max step events buffered ahead of the publisher before producers wait
+_EVENT_PIPE_MAXSIZE = 32
+
+
+class _EventPipe:
+    """
+    Publishes a hunt's step events in order from a background task,
+    so emitting overlaps with the next SSH command instead of blocking it.
+    """
+
+    def __init__(self, maxsize: int = _EVENT_PIPE_MAXSIZE) -> None:
+        self._queue: asyncio.Queue[BaseEvent | None] = asyncio.Queue(maxsize=maxsize)
+        self._task = asyncio.create_task(self._drain())
+
+    async def put(self, event: BaseEvent) -> None:
+        await self._queue.put(event)
+
+    async def _drain(self) -> None:
+        while (event := await self._queue.get()) is not None:
+            try:
+                await emit_event(event)
+            except Exception as exc:
+                logger.error("Hunt event emit failed for %s: %s", event.event_type, exc)
+
+    async def close(self) -> None:
+        """Flush all queued events and stop the publisher."""
+        await self._queue.put(None)
+        await self._task
+
 
 class HuntOrchestrator:
     """
@@ -112,7 +142,7 @@ class HuntOrchestrator:
             except Exception as tl_exc:
                 logger.warning("Timeline record failed for hunt start: %s", tl_exc)
 
-        all_observations: list[dict] = []
+        all_observations: list[Observation] = []
         findings_count = 0
 
         try:
@@ -131,21 +161,27 @@ class HuntOrchestrator:
                 if ctx and ctx.ssh_connection:
                     credentials = ctx.ssh_connection._credentials
 
-                for step in module.steps:
-                    if self._cancel_flags.get(hunt_id):
-                        await emit_event(HuntCancelled(session_id=session_id, hunt_id=hunt_id))
-                        await db.execute(
-                            update(HuntExecution)
-                            .where(HuntExecution.id == execution.id)
-                            .values(state=HuntState.CANCELLED)
+                events = _EventPipe()
+                try:
+                    for step in module.steps:
+                        if self._cancel_flags.get(hunt_id):
+                            await events.put(HuntCancelled(session_id=session_id, hunt_id=hunt_id))
+                            await db.execute(
+                                update(HuntExecution)
+                                .where(HuntExecution.id == execution.id)
+                                .values(state=HuntState.CANCELLED)
+                            )
+                            await db.commit()
+                            return
+
+                        step_observations = await self._execute_step(
+                            hunt_id, session_id, step, db, events, credentials=credentials,
                         )
-                        await db.commit()
-                        return
+                        all_observations.extend(step_observations)
+                finally:
+                    await events.close()
 
-                    step_observations = await self._execute_step(
-                        hunt_id, session_id, step, db, credentials=credentials,
-                    )
-                    all_observations.extend(step_observations)
+                observation_dicts = [obs.to_dict() for obs in all_observations]
 
                 if run_ai:
                     # AI analysis (imported lazily to avoid circular imports)
@@ -155,7 +191,7 @@ class HuntOrchestrator:
                             session_id=session_id,
                             hunt_id=hunt_id,
                             module=module,
-                            observations=all_observations,
+                            observations=observation_dicts,
                             db=db,
                         )
                     except Exception as exc:
@@ -169,7 +205,7 @@ class HuntOrchestrator:
                     .values(
                         state=HuntState.COMPLETED,
                         completed_at=datetime.now(timezone.utc),
-                        observations=all_observations,
+                        observations=observation_dicts,
                     )
                 )
                 await db.commit()
@@ -231,9 +267,10 @@ class HuntOrchestrator:
         session_id: str,
         step: HuntStep,
         db: AsyncSession,
+        events: _EventPipe,
         credentials: dict | None = None,
-    ) -> list[dict]:
-        await emit_event(
+    ) -> list[Observation]:
+        await events.put(
             HuntStepStarted(
                 session_id=session_id,
                 hunt_id=hunt_id,
@@ -242,7 +279,7 @@ class HuntOrchestrator:
             )
         )
 
-        observations: list[dict] = []
+        observations: list[Observation] = []
         try:
             # Apply sudo policy based on asset's sudo_method
             from app.core.security.classifier import SudoPolicy
@@ -268,41 +305,40 @@ class HuntOrchestrator:
             truncated_stdout = stdout[:MAX_STDOUT] if stdout else ""
             truncated_stderr = stderr[:MAX_STDERR] if stderr else ""
 
-            obs = {
-                "step_id": step.id,
-                "command": command,
-                "stdout": truncated_stdout,
-                "stderr": truncated_stderr,
-                "exit_code": exit_code,
-                "truncated": len(stdout) > MAX_STDOUT or len(stderr) > MAX_STDERR,
-            }
+            obs = Observation(
+                step_id=step.id,
+                command=command,
+                stdout=truncated_stdout,
+                stderr=truncated_stderr,
+                exit_code=exit_code,
+                truncated=len(stdout) > MAX_STDOUT or len(stderr) > MAX_STDERR,
+            )
             observations.append(obs)
 
             obs_id = str(uuid.uuid4())
-            await emit_event(
+            await events.put(
                 HuntObservation(
                     session_id=session_id,
                     hunt_id=hunt_id,
                     observation_id=obs_id,
-                    data=obs,
+                    data=obs.to_dict(),
                 )
             )
 
         except Exception as exc:
             logger.warning("Step %s failed in hunt %s: %s", step.id, hunt_id, exc)
-            observations.append({
-                "step_id": step.id,
-                "command": step.command,
-                "error": str(exc),
-                "exit_code": -1,
-            })
-
-        await emit_event(
+            observations.append(Observation(
+                step_id=step.id,
+                command=step.command,
+                error=str(exc),
+            ))
+
+        await events.put(
             HuntStepCompleted(
                 session_id=session_id,
                 hunt_id=hunt_id,
                 step_id=step.id,
-                observations=observations,
+                observations=[obs.to_dict() for obs in observations],
             )
         )
 
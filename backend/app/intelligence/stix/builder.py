@@ -5,6 +5,12 @@ from datetime import datetime, timezone
 
 from app.ai.schema import AiFinding
 
+_MITRE_TECHNIQUE_URL = "https://attack.mitre.org/techniques/"
+
+# Shared key layout for the per-technique objects; copied then filled in.
+_AP_TEMPLATE = {"type": "attack-pattern", "spec_version": "2.1"}
+_REL_TEMPLATE = {"type": "relationship", "spec_version": "2.1", "relationship_type": "indicates"}
+
 
 def _now_str() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -19,6 +25,10 @@ def build_stix_bundle(finding: AiFinding) -> dict:
     indicator_id = f"indicator--{uuid.uuid4()}"
     report_id = f"report--{uuid.uuid4()}"
     now = _now_str()
+    conf = int(finding.confidence * 100)
+    techs = finding.technique_ids
+    title = finding.title
+    desc = finding.description
 
     objects = []
 
@@ -49,51 +59,45 @@ def build_stix_bundle(finding: AiFinding) -> dict:
         "id": indicator_id,
         "created": now,
         "modified": now,
-        "name": finding.title,
-        "description": finding.description,
+        "name": title,
+        "description": desc,
         "indicator_types": ["malicious-activity"],
         "pattern": pattern,
         "pattern_type": "stix",
         "valid_from": now,
-        "confidence": int(finding.confidence * 100),
-        "labels": finding.technique_ids,
+        "confidence": conf,
+        "labels": techs,
     }
     objects.append(indicator)
 
     # ── Attack Pattern objects (per MITRE technique) ──────────────────────────
     attack_pattern_ids = []
-    for technique_id in finding.technique_ids:
+    for technique_id in techs:
         ap_id = f"attack-pattern--{uuid.uuid4()}"
         attack_pattern_ids.append(ap_id)
-        objects.append({
-            "type": "attack-pattern",
-            "spec_version": "2.1",
-            "id": ap_id,
-            "created": now,
-            "modified": now,
-            "name": technique_id,
-            "external_references": [
-                {
-                    "source_name": "mitre-attack",
-                    "external_id": technique_id,
-                    "url": f"https://attack.mitre.org/techniques/{technique_id.replace('.', '/')}",
-                }
-            ],
-        })
+        obj = _AP_TEMPLATE.copy()
+        obj["id"] = ap_id
+        obj["created"] = now
+        obj["modified"] = now
+        obj["name"] = technique_id
+        obj["external_references"] = [
+            {
+                "source_name": "mitre-attack",
+                "external_id": technique_id,
+                "url": _MITRE_TECHNIQUE_URL + technique_id.replace(".", "/"),
+            }
+        ]
+        objects.append(obj)
 
     # ── Relationships ─────────────────────────────────────────────────────────
     for ap_id in attack_pattern_ids:
-        rel_id = f"relationship--{uuid.uuid4()}"
-        objects.append({
-            "type": "relationship",
-            "spec_version": "2.1",
-            "id": rel_id,
-            "created": now,
-            "modified": now,
-            "relationship_type": "indicates",
-            "source_ref": indicator_id,
-            "target_ref": ap_id,
-        })
+        rel = _REL_TEMPLATE.copy()
+        rel["id"] = f"relationship--{uuid.uuid4()}"
+        rel["created"] = now
+        rel["modified"] = now
+        rel["source_ref"] = indicator_id
+        rel["target_ref"] = ap_id
+        objects.append(rel)
 
     # ── Report object ─────────────────────────────────────────────────────────
     object_refs = [obj["id"] for obj in objects]
@@ -103,12 +107,12 @@ def build_stix_bundle(finding: AiFinding) -> dict:
         "id": report_id,
         "created": now,
         "modified": now,
-        "name": finding.title,
-        "description": finding.description,
+        "name": title,
+        "description": desc,
         "published": now,
         "report_types": ["threat-report"],
         "object_refs": object_refs,
-        "confidence": int(finding.confidence * 100),
+        "confidence": conf,
         "labels": [finding.severity],
     }
     objects.append(report)
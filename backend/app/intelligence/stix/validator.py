@@ -3,6 +3,8 @@ from __future__ import annotations
 import json
 import logging
 
+import fastjsonschema
+
 logger = logging.getLogger(__name__)
 
 
@@ -10,27 +12,81 @@ class StixValidationError(Exception):
     pass
 
 
-def validate_bundle(bundle: dict) -> None:
+_STIX_ID = r"^[a-z][a-z0-9-]*--[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$"
+_TIMESTAMP = r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d+)?Z$"
+
+
+def _typed(stix_type: str, required: list[str]) -> dict:
+    return {
+        "if": {"properties": {"type": {"const": stix_type}}},
+        "then": {"required": required},
+    }
+
+
+# Covers only the fields build_stix_bundle() emits — not the full STIX 2.1 spec.
+BUNDLE_SCHEMA: dict = {
+    "type": "object",
+    "required": ["type", "id", "spec_version", "objects"],
+    "properties": {
+        "type": {"const": "bundle"},
+        "id": {"type": "string", "pattern": _STIX_ID},
+        "spec_version": {"const": "2.1"},
+        "objects": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["type", "spec_version", "id", "created", "modified"],
+                "properties": {
+                    "type": {"type": "string", "pattern": r"^[a-z][a-z0-9-]*$"},
+                    "spec_version": {"const": "2.1"},
+                    "id": {"type": "string", "pattern": _STIX_ID},
+                    "created": {"type": "string", "pattern": _TIMESTAMP},
+                    "modified": {"type": "string", "pattern": _TIMESTAMP},
+                    "confidence": {"type": "integer", "minimum": 0, "maximum": 100},
+                    "object_refs": {
+                        "type": "array",
+                        "items": {"type": "string", "pattern": _STIX_ID},
+                    },
+                    "source_ref": {"type": "string", "pattern": _STIX_ID},
+                    "target_ref": {"type": "string", "pattern": _STIX_ID},
+                },
+                "allOf": [
+                    _typed("indicator", ["pattern", "pattern_type", "valid_from"]),
+                    _typed("attack-pattern", ["name"]),
+                    _typed("relationship", ["relationship_type", "source_ref", "target_ref"]),
+                    _typed("report", ["name", "published", "object_refs"]),
+                ],
+            },
+        },
+    },
+}
+
+# Compiled once at import; validation is then a plain function call.
+_VALIDATE = fastjsonschema.compile(BUNDLE_SCHEMA)
+
+
+def validate_bundle(bundle: dict, strict: bool = False) -> None:
     """
     Validate a STIX 2.1 bundle dict.
 
-    Uses the stix2 library for full validation.
+    Checks the structure against BUNDLE_SCHEMA. Pass strict=True to also
+    run the stix2 library for full spec conformance.
     Raises StixValidationError on failure.
     """
-    if bundle.get("type") != "bundle":
-        raise StixValidationError("Bundle must have type='bundle'")
-
-    if bundle.get("spec_version") != "2.1":
-        raise StixValidationError("Bundle must have spec_version='2.1'")
+    try:
+        _VALIDATE(bundle)
+    except fastjsonschema.JsonSchemaException as exc:
+        raise StixValidationError(f"STIX validation failed: {exc.message}") from exc
 
-    if not isinstance(bundle.get("objects"), list):
-        raise StixValidationError("Bundle must have 'objects' list")
+    if not strict:
+        logger.debug("STIX bundle validated: %s", bundle.get("id"))
+        return
 
     try:
         import stix2
         bundle_str = json.dumps(bundle)
         stix2.parse(bundle_str, allow_custom=True)
-        logger.debug("STIX bundle validated: %s", bundle.get("id"))
+        logger.debug("STIX bundle strictly validated: %s", bundle.get("id"))
     except ImportError:
         logger.warning("stix2 library not available — skipping deep validation")
     except Exception as exc:
@@ -1,33 +1,170 @@
 from __future__ import annotations
 
+import asyncio
+import functools
 import hashlib
 import logging
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import select, update
+from sqlalchemy import func, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.ai.schema import AiFinding
+from app.core.db.ids import as_uuid
 from app.core.db.models import Finding, FindingStatus, Severity
 
 logger = logging.getLogger(__name__)
 
+UPSERT_MAX_BATCH = 500
 
-def compute_content_hash(asset_id: str, title: str, technique_ids: list[str]) -> str:
+_sha256 = hashlib.sha256
+
+
+@functools.lru_cache(maxsize=4096)
+def compute_content_hash(asset_id: str, title: str, technique_ids: tuple[str, ...]) -> str:
     """
     SHA-256 of (asset_id || title || primary_technique_id).
-    Used as deduplication key.
+    Used as deduplication key. The digest is persisted in findings.content_hash,
+    so switching algorithms requires rehashing existing rows first.
+    Memoised since repeat sightings reuse the same triple.
     """
     primary_technique = technique_ids[0] if technique_ids else ""
-    raw = f"{asset_id}|{title}|{primary_technique}"
-    return hashlib.sha256(raw.encode()).hexdigest()
+    return _sha256(
+        b"|".join((asset_id.encode(), title.encode(), primary_technique.encode()))
+    ).hexdigest()
+
+
+class FindingUpserter:
+    """
+    Collects finding rows from concurrent callers and writes each batch with a
+    single INSERT ... ON CONFLICT (content_hash) DO UPDATE on its own session.
+    Callers await a future that resolves to the finding ID once the batch commits.
+    A batch is flushed as soon as no more rows are queued, so a lone finding is
+    written without delay.
+    """
+
+    def __init__(self, max_batch: int = UPSERT_MAX_BATCH) -> None:
+        self._max_batch = max_batch
+        # None is the stop sentinel posted by close()
+        self._queue: asyncio.Queue[tuple[dict, asyncio.Future[str]] | None] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+
+    async def submit(self, row: dict) -> str:
+        fut: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((row, fut))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="finding-upserter")
+        return await fut
+
+    async def _run(self) -> None:
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            stop = False
+            while len(batch) < self._max_batch:
+                if self._queue.empty():
+                    # One yield lets submitters running concurrently (e.g. gathered
+                    # findings of one hunt) enqueue before the batch is written
+                    await asyncio.sleep(0)
+                    if self._queue.empty():
+                        break
+                item = self._queue.get_nowait()
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+            if stop:
+                return
+
+    async def _flush(self, batch: list[tuple[dict, asyncio.Future[str]]]) -> None:
+        from app.core.db.engine import AsyncSessionLocal
+
+        error: BaseException | None = None
+        try:
+            # Postgres rejects one statement touching the same conflict row twice,
+            # so repeat sightings within a batch are merged into a single row.
+            rows: dict[str, dict] = {}
+            for row, _ in batch:
+                merged = rows.get(row["content_hash"])
+                if merged is None:
+                    rows[row["content_hash"]] = dict(row)
+                else:
+                    merged["sighting_count"] += 1
+                    merged["confidence"] = max(merged["confidence"], row["confidence"])
+                    merged["last_seen"] = row["last_seen"]
+
+            stmt = pg_insert(Finding).values(list(rows.values()))
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Finding.content_hash],
+                set_={
+                    "last_seen": stmt.excluded.last_seen,
+                    "sighting_count": Finding.sighting_count + stmt.excluded.sighting_count,
+                    "confidence": func.greatest(Finding.confidence, stmt.excluded.confidence),
+                },
+            ).returning(
+                Finding.id,
+                Finding.content_hash,
+                # xmax is 0 only on a freshly inserted tuple; an update sets it
+                literal_column("(xmax = 0)").label("inserted"),
+            )
+
+            async with AsyncSessionLocal() as fdb:
+                result = await fdb.execute(stmt)
+                returned = result.all()
+                await fdb.commit()
+
+            ids: dict[str, str] = {}
+            for finding_id, content_hash, inserted in returned:
+                ids[content_hash] = str(finding_id)
+                if inserted:
+                    logger.info(
+                        "New finding persisted: %s (severity=%s)",
+                        finding_id, rows[content_hash]["severity"].value,
+                    )
+                else:
+                    logger.info("Dedup hit for finding %s (hash=%s)", finding_id, content_hash[:16])
+
+            for row, fut in batch:
+                if not fut.done():
+                    fut.set_result(ids[row["content_hash"]])
+        except Exception as exc:
+            logger.error("Finding upsert batch failed (%d rows): %s", len(batch), exc)
+            error = exc
+        finally:
+            # Never leave a submitter waiting, whatever happened above
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(error or RuntimeError("finding upsert interrupted"))
+
+    async def close(self) -> None:
+        """Write any queued rows, then stop the flush task. Called during server shutdown."""
+        if self._task is not None and not self._task.done():
+            # Let the in-flight batch finish; the task exits once it reaches the sentinel
+            self._queue.put_nowait(None)
+            await self._task
+        self._task = None
+
+        pending = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not None:
+                pending.append(item)
+        if pending:
+            await self._flush(pending)
+
+
+finding_upserter = FindingUpserter()
 
 
 async def upsert_finding(
-    session_id: str,
-    asset_id: str | None,
-    hunt_id: str,
+    session_id: uuid.UUID | str,
+    asset_id: uuid.UUID | str | None,
+    hunt_id: uuid.UUID | str,
     ai_finding: AiFinding,
     confidence: float,
     stix_bundle: dict | None,
@@ -36,67 +173,36 @@ async def upsert_finding(
 ) -> str:
     """
     Insert a new Finding or update sighting_count on duplicate.
-    Uses an independent DB session with its own commit so findings survive
-    even if the caller's transaction is rolled back or never committed
-    (e.g. browser refresh during a running hunt).
+    Rows are batched by finding_upserter and committed on an independent DB
+    session so findings survive even if the caller's transaction is rolled
+    back or never committed (e.g. browser refresh during a running hunt).
     Returns the finding ID.
     """
     if not asset_id:
         logger.warning("No asset_id provided for finding — skipping persist")
         return ""
 
-    from app.core.db.engine import AsyncSessionLocal
-
     content_hash = compute_content_hash(
-        asset_id, ai_finding.title, ai_finding.technique_ids
+        str(asset_id), ai_finding.title, tuple(ai_finding.technique_ids)
     )
 
-    async with AsyncSessionLocal() as fdb:
-        # Check for existing finding by content_hash
-        result = await fdb.execute(
-            select(Finding).where(Finding.content_hash == content_hash)
-        )
-        existing = result.scalar_one_or_none()
-
-        if existing is not None:
-            # Dedup hit — update sighting
-            now = datetime.now(timezone.utc)
-            await fdb.execute(
-                update(Finding)
-                .where(Finding.id == existing.id)
-                .values(
-                    last_seen=now,
-                    sighting_count=Finding.sighting_count + 1,
-                    confidence=max(existing.confidence, confidence),
-                )
-            )
-            await fdb.commit()
-            logger.info("Dedup hit for finding %s (hash=%s)", existing.id, content_hash[:16])
-            return str(existing.id)
+    try:
+        severity_enum = Severity(ai_finding.severity.lower())
+    except ValueError:
+        severity_enum = Severity.medium
 
-        # New finding
-        finding_id = uuid.uuid4()
-        try:
-            severity_enum = Severity(ai_finding.severity.lower())
-        except ValueError:
-            severity_enum = Severity.medium
-
-        finding = Finding(
-            id=finding_id,
-            session_id=uuid.UUID(session_id),
-            asset_id=uuid.UUID(asset_id),
-            hunt_execution_id=uuid.UUID(hunt_id),
-            title=ai_finding.title,
-            severity=severity_enum,
-            confidence=confidence,
-            content_hash=content_hash,
-            stix_bundle=stix_bundle,
-            remediation=remediation,
-            status=FindingStatus.open,
-            sighting_count=1,
-        )
-        fdb.add(finding)
-        await fdb.commit()
-
-        logger.info("New finding persisted: %s (severity=%s)", finding_id, ai_finding.severity)
-        return str(finding_id)
+    return await finding_upserter.submit({
+        "id": uuid.uuid4(),
+        "session_id": as_uuid(session_id),
+        "asset_id": as_uuid(asset_id),
+        "hunt_execution_id": as_uuid(hunt_id),
+        "title": ai_finding.title,
+        "severity": severity_enum,
+        "confidence": confidence,
+        "content_hash": content_hash,
+        "stix_bundle": stix_bundle,
+        "remediation": remediation,
+        "status": FindingStatus.open,
+        "sighting_count": 1,
+        "last_seen": datetime.now(timezone.utc),
+    })
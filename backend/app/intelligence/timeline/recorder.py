@@ -4,35 +4,43 @@ import logging
 import uuid
 from datetime import datetime, timezone
 
+import orjson
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.db.ids import as_uuid
 from app.core.db.models import TimelineEvent
 from app.core.events.emitter import emit_event
 from app.core.events.schema import TimelineEventRecorded
 
 logger = logging.getLogger(__name__)
 
+# Batches at or above this size go through COPY; smaller ones use a multi-row INSERT
+COPY_THRESHOLD = 100
+
+_COPY_COLUMNS = ("id", "asset_id", "session_id", "event_type", "payload", "occurred_at", "analyst_id")
+
 
 async def record_timeline_event(
-    asset_id: str,
+    asset_id: uuid.UUID | str,
     event_type: str,
     analyst_id: str,
     payload: dict | None = None,
-    session_id: str | None = None,
+    session_id: uuid.UUID | str | None = None,
     db: AsyncSession | None = None,
 ) -> str:
     """
     Persist a timeline event and emit TimelineEventRecorded.
     Returns the event ID.
     """
-    event_id = str(uuid.uuid4())
+    event_uuid = uuid.uuid4()
     now = datetime.now(timezone.utc)
 
     if db is not None:
         te = TimelineEvent(
-            id=uuid.UUID(event_id),
-            asset_id=uuid.UUID(asset_id),
-            session_id=uuid.UUID(session_id) if session_id else None,
+            id=event_uuid,
+            asset_id=as_uuid(asset_id),
+            session_id=as_uuid(session_id) if session_id else None,
             event_type=event_type,
             payload=payload or {},
             occurred_at=now,
@@ -41,9 +49,10 @@ async def record_timeline_event(
         db.add(te)
         await db.flush()
 
+    event_id = str(event_uuid)
     await emit_event(
         TimelineEventRecorded(
-            asset_id=asset_id,
+            asset_id=str(asset_id),
             event_id=event_id,
             event_type_name=event_type,
         )
@@ -51,3 +60,59 @@ async def record_timeline_event(
 
     logger.debug("Timeline event recorded: type=%s asset=%s", event_type, asset_id)
     return event_id
+
+
+async def record_timeline_events_bulk(events: list[dict], db: AsyncSession) -> list[str]:
+    """
+    Persist many timeline events in one round trip and emit TimelineEventRecorded for each.
+    Each dict takes the record_timeline_event keyword arguments (asset_id, event_type,
+    analyst_id, payload, session_id) plus an optional occurred_at.
+    Large batches are streamed with asyncpg COPY. Returns the event IDs in input order.
+    """
+    if not events:
+        return []
+
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "asset_id": as_uuid(ev["asset_id"]),
+            "session_id": as_uuid(ev["session_id"]) if ev.get("session_id") else None,
+            "event_type": ev["event_type"],
+            "payload": ev.get("payload") or {},
+            "occurred_at": ev.get("occurred_at") or now,
+            "analyst_id": ev["analyst_id"],
+        }
+        for ev in events
+    ]
+
+    if len(rows) >= COPY_THRESHOLD:
+        conn = await db.connection()
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            TimelineEvent.__tablename__,
+            # asyncpg's jsonb codec expects text, so payloads are pre-serialised
+            records=[
+                (r["id"], r["asset_id"], r["session_id"], r["event_type"],
+                 orjson.dumps(r["payload"]).decode(), r["occurred_at"], r["analyst_id"])
+                for r in rows
+            ],
+            columns=_COPY_COLUMNS,
+        )
+    else:
+        await db.execute(pg_insert(TimelineEvent).values(rows))
+
+    event_ids = []
+    for r in rows:
+        event_id = str(r["id"])
+        event_ids.append(event_id)
+        await emit_event(
+            TimelineEventRecorded(
+                asset_id=str(r["asset_id"]),
+                event_id=event_id,
+                event_type_name=r["event_type"],
+            )
+        )
+
+    logger.debug("Timeline events recorded in bulk: count=%d", len(rows))
+    return event_ids
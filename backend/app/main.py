@@ -13,7 +13,10 @@ from slowapi.middleware import SlowAPIMiddleware
 from slowapi.util import get_remote_address
 
 from app.config import settings
-from app.core.events.emitter import bus_drain_loop
+from app.core.events.bus import event_bus
+from app.core.events.emitter import bus_drain_loop, close_emitter, start_emitter
+from app.core.session.manager import session_manager
+from app.hunt.loader import module_registry
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
@@ -35,7 +38,6 @@ async def lifespan(app: FastAPI):
         )
 
     # Load hunt module registry
-    from app.hunt.loader import module_registry
     module_registry.load_all()
 
     # Clean up orphaned sessions from previous server runs.
@@ -56,15 +58,28 @@ async def lifespan(app: FastAPI):
         if orphaned:
             logger.info("Cleaned up %d orphaned session(s) from previous run", len(orphaned))
 
+    # Start the batched Socket.IO emit flusher
+    start_emitter()
+
     # Start bus drain background task
     drain_task = asyncio.create_task(bus_drain_loop())
 
-    # Start stale session reaper (runs every 5 minutes)
+    # Start stale session reaper: wakes when a disconnected session has outlasted its
+    # reconnect window, and at least every 5 minutes, but never more than once per
+    # REAP_MIN_INTERVAL.
+    REAP_MAX_INTERVAL = 300
+    REAP_MIN_INTERVAL = 10
+
     async def _session_reaper():
-        from app.core.session.manager import session_manager
+        loop = asyncio.get_running_loop()
+        last_reap = loop.time()
         while True:
             try:
-                await asyncio.sleep(300)
+                await session_manager.wait_for_reap_hint(timeout=REAP_MAX_INTERVAL)
+                wait = REAP_MIN_INTERVAL - (loop.time() - last_reap)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                last_reap = loop.time()
                 await session_manager.reap_stale_sessions()
             except asyncio.CancelledError:
                 break
@@ -82,9 +97,18 @@ async def lifespan(app: FastAPI):
     drain_task.cancel()
 
     # Gracefully terminate all active sessions
-    from app.core.session.manager import session_manager
     await session_manager.shutdown_all()
 
+    # Write any findings still waiting for a batch flush
+    from app.intelligence.timeline.deduplicator import finding_upserter
+    await finding_upserter.close()
+
+    from app.mcp.orchestrator import close_providers
+    await close_providers()
+
+    # Send Socket.IO events still queued behind the emit flush task
+    await close_emitter()
+
     try:
         await drain_task
     except asyncio.CancelledError:
@@ -120,14 +144,17 @@ app.add_middleware(
 from app.core.db.models import User, UserRole
 from app.core.db.engine import get_async_session
 from app.core.security.auth import (
-    hash_password,
-    verify_password,
+    ahash_password,
+    averify_password,
     create_access_token,
     create_refresh_token,
     verify_refresh_token,
+    cache_user_status,
+    get_cached_user_status,
+    invalidate_user_status,
 )
 from fastapi import Depends, HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import CurrentUser
 
@@ -162,7 +189,7 @@ async def login(
     result = await db.execute(select(User).where(User.username == body.username))
     user = result.scalar_one_or_none()
 
-    if user is None or not verify_password(body.password, user.password_hash):
+    if user is None or not await averify_password(body.password, user.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
     if not user.is_active:
@@ -182,14 +209,23 @@ async def refresh_token(body: dict, db: AsyncSession = Depends(get_async_session
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(exc)) from exc
 
-    result = await db.execute(select(User).where(User.username == payload["sub"]))
-    user = result.scalar_one_or_none()
-    if user is None or not user.is_active:
+    username = payload["sub"]
+    cached = get_cached_user_status(username)
+    if cached is None:
+        result = await db.execute(select(User).where(User.username == username))
+        user = result.scalar_one_or_none()
+        if user is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        cached = (user.is_active, user.role.value)
+        cache_user_status(username, *cached)
+
+    is_active, role = cached
+    if not is_active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
 
     return TokenResponse(
-        access_token=create_access_token(user.username, user.role.value),
-        refresh_token=create_refresh_token(user.username, user.role.value),
+        access_token=create_access_token(username, role),
+        refresh_token=create_refresh_token(username, role),
     )
 
 
@@ -222,7 +258,7 @@ async def register(body: RegisterRequest, db: AsyncSession = Depends(get_async_s
 
     user = User(
         username=body.username,
-        password_hash=hash_password(body.password),
+        password_hash=await ahash_password(body.password),
         role=role,
         is_active=True,
     )
@@ -242,12 +278,13 @@ async def change_password(
     if user is None or not user.is_active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found or inactive")
 
-    if not verify_password(body.current_password, user.password_hash):
+    if not await averify_password(body.current_password, user.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid current password")
 
-    user.password_hash = hash_password(body.new_password)
+    user.password_hash = await ahash_password(body.new_password)
     await db.flush()
     await db.commit()
+    invalidate_user_status(user.username)
     return {"ok": True}
 
 
@@ -255,10 +292,6 @@ async def change_password(
 
 @app.get("/health", tags=["system"])
 async def health():
-    from app.core.session.manager import session_manager
-    from app.core.events.bus import event_bus
-    from app.hunt.loader import module_registry
-
     return {
         "status": "ok",
         "env": settings.app_env,
@@ -269,26 +302,26 @@ async def health():
 
 
 @app.get("/api/v1/system/status", tags=["system"])
-async def system_status(db: AsyncSession = Depends(get_async_session)):
-    from app.core.session.manager import session_manager
-    from app.core.events.bus import event_bus
-    from app.hunt.loader import module_registry
-    from sqlalchemy import func, select as sa_select
-    from app.core.db.models import Finding, Asset
-
-    # Count findings
-    finding_count = (await db.execute(sa_select(func.count(Finding.id)))).scalar() or 0
-    asset_count = (await db.execute(sa_select(func.count(Asset.id)))).scalar() or 0
-
-    # Session breakdown
-    sessions_by_state: dict[str, int] = {}
-    for ctx in session_manager.get_all():
-        sessions_by_state[ctx.state] = sessions_by_state.get(ctx.state, 0) + 1
+async def system_status(approximate: bool = False, db: AsyncSession = Depends(get_async_session)):
+    # Both counts in one round trip. approximate=true reads planner estimates from
+    # pg_class instead of scanning; reltuples is -1 until a table is first analysed.
+    if approximate:
+        row = (await db.execute(text(
+            "SELECT"
+            " (SELECT reltuples::bigint FROM pg_class WHERE oid = 'findings'::regclass) AS findings,"
+            " (SELECT reltuples::bigint FROM pg_class WHERE oid = 'assets'::regclass) AS assets"
+        ))).one()
+    else:
+        row = (await db.execute(text(
+            "SELECT (SELECT count(*) FROM findings) AS findings, (SELECT count(*) FROM assets) AS assets"
+        ))).one()
+    finding_count = max(row.findings or 0, 0)
+    asset_count = max(row.assets or 0, 0)
 
     return {
         "active_sessions": session_manager.active_count,
         "max_sessions": settings.max_sessions,
-        "sessions_by_state": sessions_by_state,
+        "sessions_by_state": session_manager.get_state_counts(),
         "event_bus_depth": event_bus.qsize,
         "event_bus_limit": settings.event_queue_max,
         "hunt_modules_loaded": len(module_registry.list_modules()),
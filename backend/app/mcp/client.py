@@ -1,39 +1,73 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
 import httpx
+import orjson
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_TIMEOUT = 15.0
+CONNECT_TIMEOUT = 5.0
+KEEPALIVE_EXPIRY = 60.0
+MAX_KEEPALIVE_CONNECTIONS = 32
+MAX_CONNECTIONS = 64
+DEFAULT_MAX_CONCURRENCY = 4
 
 
 class McpHttpClient:
     """
     Base HTTP client for MCP providers.
     Subclasses implement lookup() with provider-specific logic.
+    Holds one pooled HTTP/2 client for the provider's lifetime; call aclose() on shutdown.
+    `semaphore` caps in-flight lookups so bursts of indicators stay under provider rate limits.
+    SUPPORTED_IOC_TYPES lists the IOC types lookup() can answer; others are skipped upstream.
     """
 
-    def __init__(self, base_url: str, api_key: str, timeout: float = DEFAULT_TIMEOUT) -> None:
+    SUPPORTED_IOC_TYPES: frozenset[str] = frozenset()
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        headers: dict | None = None,
+    ) -> None:
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
         self.timeout = timeout
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=headers,
+            timeout=httpx.Timeout(timeout, connect=CONNECT_TIMEOUT),
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                max_connections=MAX_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+        )
 
     async def get(self, path: str, params: dict | None = None, headers: dict | None = None) -> dict:
-        url = f"{self.base_url}/{path.lstrip('/')}"
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            resp = await client.get(url, params=params, headers=headers or {})
-            resp.raise_for_status()
-            return resp.json()
+        resp = await self._client.get(path.lstrip("/"), params=params, headers=headers)
+        resp.raise_for_status()
+        return orjson.loads(resp.content)
 
     async def post(self, path: str, json: dict | None = None, headers: dict | None = None) -> dict:
-        url = f"{self.base_url}/{path.lstrip('/')}"
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            resp = await client.post(url, json=json, headers=headers or {})
-            resp.raise_for_status()
-            return resp.json()
+        content = None
+        if json is not None:
+            content = orjson.dumps(json)
+            headers = {**(headers or {}), "Content-Type": "application/json"}
+        resp = await self._client.post(path.lstrip("/"), content=content, headers=headers)
+        resp.raise_for_status()
+        return orjson.loads(resp.content)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
 
     async def lookup(self, ioc_type: str, ioc_value: str) -> dict:
         raise NotImplementedError
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
 
+from cachetools import TTLCache
+
 from app.config import settings
 from app.core.events.emitter import emit_event
 from app.core.events.schema import (
@@ -11,6 +14,7 @@ from app.core.events.schema import (
     McpLookupFailed,
     McpLookupStarted,
 )
+from .client import McpHttpClient
 from .enrichment import EnrichmentResult
 from .providers.virustotal import VirusTotalProvider
 from .providers.shodan import ShodanProvider
@@ -18,25 +22,55 @@ from .providers.abuseipdb import AbuseIPDBProvider
 
 logger = logging.getLogger(__name__)
 
+_SUPPORTED_IOC_TYPES = frozenset({"ip", "domain", "hash"})
+
+# (provider, ioc_type, ioc_value) -> successful result; reputation data is stable for hours
+_result_cache: TTLCache[tuple[str, str, str], EnrichmentResult] = TTLCache(
+    maxsize=10_000, ttl=settings.mcp_cache_ttl,
+)
+# Failed lookups (404s, rate limits) are remembered briefly so retries don't hammer the provider
+_error_cache: TTLCache[tuple[str, str, str], EnrichmentResult] = TTLCache(
+    maxsize=4096, ttl=settings.mcp_error_cache_ttl,
+)
+# Lookups currently on the wire; concurrent callers for the same key await the same future
+_inflight: dict[tuple[str, str, str], asyncio.Future[EnrichmentResult]] = {}
 
-def _build_providers() -> list:
-    providers = []
+
+@functools.lru_cache(maxsize=1)
+def _build_providers() -> tuple[McpHttpClient, ...]:
+    """Instantiate configured providers once; settings are fixed for the process lifetime."""
+    providers: list[McpHttpClient] = []
     if settings.virustotal_api_key:
         providers.append(VirusTotalProvider(
             api_key=settings.virustotal_api_key,
             base_url=settings.virustotal_mcp_url,
+            max_concurrency=settings.mcp_max_concurrency,
         ))
     if settings.shodan_api_key:
         providers.append(ShodanProvider(
             api_key=settings.shodan_api_key,
             base_url=settings.shodan_mcp_url,
+            max_concurrency=settings.mcp_max_concurrency,
         ))
     if settings.abuseipdb_api_key:
         providers.append(AbuseIPDBProvider(
             api_key=settings.abuseipdb_api_key,
             base_url=settings.abuseipdb_mcp_url,
+            max_concurrency=settings.mcp_max_concurrency,
         ))
-    return providers
+    return tuple(providers)
+
+
+async def close_providers() -> None:
+    """Close pooled provider HTTP clients. Called during server shutdown."""
+    if not _build_providers.cache_info().currsize:
+        return
+    for provider in _build_providers():
+        try:
+            await provider.aclose()
+        except Exception as exc:
+            logger.warning("Error closing MCP provider %s: %s", type(provider).__name__, exc)
+    _build_providers.cache_clear()
 
 
 async def enrich_ioc(
@@ -47,33 +81,23 @@ async def enrich_ioc(
 ) -> list[EnrichmentResult]:
     """
     Run all configured providers in parallel for a single IOC.
-    Emits MCP events for each lookup.
+    Emits MCP events for each lookup as soon as that provider answers.
     """
-    providers = _build_providers()
-    if not providers:
+    all_providers = _build_providers()
+    if not all_providers:
         logger.warning("No MCP providers configured — skipping enrichment")
         return []
 
-    tasks = []
-    for provider in providers:
-        tasks.append(
-            _lookup_one(session_id, finding_id, ioc_type, ioc_value, provider)
-        )
-
-    results = await asyncio.gather(*tasks, return_exceptions=False)
-    valid = [r for r in results if r is not None]
-
-    if valid:
-        summary = "; ".join(r.summary() for r in valid)
-        await emit_event(
-            McpEnrichmentApplied(
-                session_id=session_id,
-                finding_id=finding_id,
-                enrichment_summary=summary,
-            )
-        )
+    providers = [p for p in all_providers if ioc_type in p.SUPPORTED_IOC_TYPES]
+    if not providers:
+        return []
 
-    return valid
+    # return_exceptions: one provider failing must not cancel or discard the others
+    results = await asyncio.gather(
+        *(_lookup_one(session_id, finding_id, ioc_type, ioc_value, provider) for provider in providers),
+        return_exceptions=True,
+    )
+    return [r for r in results if isinstance(r, EnrichmentResult)]
 
 
 async def _lookup_one(
@@ -81,22 +105,22 @@ async def _lookup_one(
     finding_id: str,
     ioc_type: str,
     ioc_value: str,
-    provider,
+    provider: McpHttpClient,
 ) -> EnrichmentResult | None:
     provider_name = type(provider).__name__.replace("Provider", "").lower()
 
-    await emit_event(
-        McpLookupStarted(
-            session_id=session_id,
-            finding_id=finding_id,
-            provider=provider_name,
-            ioc_type=ioc_type,
-            ioc_value=ioc_value,
+    try:
+        await emit_event(
+            McpLookupStarted(
+                session_id=session_id,
+                finding_id=finding_id,
+                provider=provider_name,
+                ioc_type=ioc_type,
+                ioc_value=ioc_value,
+            )
         )
-    )
 
-    try:
-        result = await provider.lookup(ioc_type, ioc_value)
+        result = await _cached_lookup(provider, provider_name, ioc_type, ioc_value)
 
         if result.error:
             await emit_event(
@@ -116,35 +140,85 @@ async def _lookup_one(
                     result_summary=result.summary(),
                 )
             )
+            await emit_event(
+                McpEnrichmentApplied(
+                    session_id=session_id,
+                    finding_id=finding_id,
+                    enrichment_summary=f"{provider_name}: {result.summary()}",
+                )
+            )
 
         return result
 
     except Exception as exc:
         logger.error("MCP provider %s failed: %s", provider_name, exc)
-        await emit_event(
-            McpLookupFailed(
-                session_id=session_id,
-                finding_id=finding_id,
-                provider=provider_name,
-                error=str(exc),
+        try:
+            await emit_event(
+                McpLookupFailed(
+                    session_id=session_id,
+                    finding_id=finding_id,
+                    provider=provider_name,
+                    error=str(exc),
+                )
             )
-        )
+        except Exception as emit_exc:
+            logger.error("MCP lookup-failed emit for %s failed: %s", provider_name, emit_exc)
         return None
 
 
+async def _cached_lookup(
+    provider: McpHttpClient,
+    provider_name: str,
+    ioc_type: str,
+    ioc_value: str,
+) -> EnrichmentResult:
+    """Serve from the result caches, join an identical in-flight lookup, or call the provider."""
+    key = (provider_name, ioc_type, ioc_value)
+    cached = _result_cache.get(key) or _error_cache.get(key)
+    if cached is not None:
+        return cached
+
+    pending = _inflight.get(key)
+    if pending is not None:
+        return await asyncio.shield(pending)
+
+    fut: asyncio.Future[EnrichmentResult] = asyncio.get_running_loop().create_future()
+    _inflight[key] = fut
+    try:
+        async with provider.semaphore:
+            result = await provider.lookup(ioc_type, ioc_value)
+        (_error_cache if result.error else _result_cache)[key] = result
+        fut.set_result(result)
+        return result
+    except asyncio.CancelledError:
+        # Joiners belong to other requests: fail them rather than cancelling them
+        fut.set_exception(RuntimeError(f"{provider_name} lookup was cancelled"))
+        fut.exception()
+        raise
+    except Exception as exc:
+        fut.set_exception(exc)
+        fut.exception()  # mark retrieved; joiners re-raise it themselves
+        raise
+    finally:
+        _inflight.pop(key, None)
+
+
 async def enrich_finding(session_id: str, finding_id: str, indicators: list[dict]) -> None:
     """
     Enrich all indicators from a finding.
-    Only enriches IP, domain, and hash IOC types.
+    Only enriches IP, domain, and hash IOC types; repeated indicators are looked up once.
     """
-    supported_types = {"ip", "domain", "hash"}
-    tasks = []
-
+    unique: dict[tuple[str, str], None] = {}
     for ioc in indicators:
         ioc_type = ioc.get("type", "")
         ioc_value = ioc.get("value", "")
-        if ioc_type in supported_types and ioc_value:
-            tasks.append(enrich_ioc(session_id, finding_id, ioc_type, ioc_value))
+        if ioc_type in _SUPPORTED_IOC_TYPES and ioc_value:
+            unique.setdefault((ioc_type, ioc_value), None)
 
-    if tasks:
-        await asyncio.gather(*tasks, return_exceptions=True)
+    results = await asyncio.gather(
+        *(enrich_ioc(session_id, finding_id, ioc_type, ioc_value) for ioc_type, ioc_value in unique),
+        return_exceptions=True,
+    )
+    for (ioc_type, ioc_value), result in zip(unique, results):
+        if isinstance(result, Exception):
+            logger.error("MCP enrichment of %s %s failed: %s", ioc_type, ioc_value, result)
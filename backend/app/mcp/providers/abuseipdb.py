@@ -2,17 +2,35 @@ from __future__ import annotations
 
 import logging
 
-from app.mcp.client import McpHttpClient
+from app.mcp.client import DEFAULT_MAX_CONCURRENCY, McpHttpClient
 from app.mcp.enrichment import EnrichmentResult
 
 logger = logging.getLogger(__name__)
 
+# https://www.abuseipdb.com/categories
+_CATEGORIES_MAP: dict[int, str] = {
+    3: "Fraud Orders", 4: "DDoS Attack", 5: "FTP Brute-Force",
+    6: "Ping of Death", 7: "Phishing", 8: "Fraud VoIP",
+    9: "Open Proxy", 10: "Web Spam", 11: "Email Spam",
+    12: "Blog Spam", 13: "VPN IP", 14: "Port Scan",
+    15: "Hacking", 16: "SQL Injection", 17: "Spoofing",
+    18: "Brute-Force", 19: "Bad Web Bot", 20: "Exploited Host",
+    21: "Web App Attack", 22: "SSH", 23: "IoT Targeted",
+}
+
 
 class AbuseIPDBProvider(McpHttpClient):
     """AbuseIPDB API MCP provider."""
 
-    def __init__(self, api_key: str, base_url: str = "https://api.abuseipdb.com/api/v2") -> None:
-        super().__init__(base_url=base_url, api_key=api_key)
+    SUPPORTED_IOC_TYPES = frozenset({"ip"})
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://api.abuseipdb.com/api/v2",
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> None:
+        super().__init__(base_url=base_url, api_key=api_key, max_concurrency=max_concurrency)
 
     def _headers(self) -> dict:
         return {
@@ -50,23 +68,13 @@ class AbuseIPDBProvider(McpHttpClient):
         abuse_score = info.get("abuseConfidenceScore", 0)
         score = abuse_score / 100.0
 
-        categories_map = {
-            3: "Fraud Orders", 4: "DDoS Attack", 5: "FTP Brute-Force",
-            6: "Ping of Death", 7: "Phishing", 8: "Fraud VoIP",
-            9: "Open Proxy", 10: "Web Spam", 11: "Email Spam",
-            12: "Blog Spam", 13: "VPN IP", 14: "Port Scan",
-            15: "Hacking", 16: "SQL Injection", 17: "Spoofing",
-            18: "Brute-Force", 19: "Bad Web Bot", 20: "Exploited Host",
-            21: "Web App Attack", 22: "SSH", 23: "IoT Targeted",
-        }
-
         categories = info.get("usageType", "") or ""
-        report_categories = []
+        # dict keys give O(1) membership while keeping first-seen order
+        seen: dict[str, None] = {}
         for report in info.get("reports", [])[:5]:
             for cat_id in report.get("categories", []):
-                label = categories_map.get(cat_id, str(cat_id))
-                if label not in report_categories:
-                    report_categories.append(label)
+                seen.setdefault(_CATEGORIES_MAP.get(cat_id, str(cat_id)), None)
+        report_categories = list(seen)[:8]
 
         return EnrichmentResult(
             provider="abuseipdb",
@@ -76,7 +84,7 @@ class AbuseIPDBProvider(McpHttpClient):
             score=score,
             country=info.get("countryCode"),
             isp=info.get("isp"),
-            tags=report_categories[:8],
+            tags=report_categories,
             last_seen=info.get("lastReportedAt"),
             raw={
                 "abuse_confidence_score": abuse_score,
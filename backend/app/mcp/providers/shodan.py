@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import logging
 
-from app.mcp.client import McpHttpClient
+from app.mcp.client import DEFAULT_MAX_CONCURRENCY, McpHttpClient
 from app.mcp.enrichment import EnrichmentResult
 
 logger = logging.getLogger(__name__)
@@ -11,8 +11,15 @@ logger = logging.getLogger(__name__)
 class ShodanProvider(McpHttpClient):
     """Shodan API MCP provider."""
 
-    def __init__(self, api_key: str, base_url: str = "https://api.shodan.io") -> None:
-        super().__init__(base_url=base_url, api_key=api_key)
+    SUPPORTED_IOC_TYPES = frozenset({"ip"})
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://api.shodan.io",
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> None:
+        super().__init__(base_url=base_url, api_key=api_key, max_concurrency=max_concurrency)
 
     async def lookup(self, ioc_type: str, ioc_value: str) -> EnrichmentResult:
         if ioc_type != "ip":
@@ -2,31 +2,52 @@ from __future__ import annotations
 
 import logging
 
-from app.mcp.client import McpHttpClient
+from app.mcp.client import DEFAULT_MAX_CONCURRENCY, McpHttpClient
 from app.mcp.enrichment import EnrichmentResult
 
 logger = logging.getLogger(__name__)
 
 
+def _analysis_score(data: dict) -> tuple[dict, int, float]:
+    """Return (attributes, malicious engine count, malicious ratio) from a v3 object response."""
+    attrs = data.get("data", {}).get("attributes", {})
+    stats = attrs.get("last_analysis_stats") or {}
+    malicious = stats.get("malicious", 0)
+    total = 0
+    for count in stats.values():
+        total += count
+    return attrs, malicious, (malicious / total if total else 0.0)
+
+
 class VirusTotalProvider(McpHttpClient):
     """VirusTotal v3 API MCP provider."""
 
-    def __init__(self, api_key: str, base_url: str = "https://www.virustotal.com/api/v3") -> None:
-        super().__init__(base_url=base_url, api_key=api_key)
+    SUPPORTED_IOC_TYPES = frozenset({"ip", "domain", "hash"})
 
-    def _headers(self) -> dict:
-        return {"x-apikey": self.api_key}
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://www.virustotal.com/api/v3",
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> None:
+        super().__init__(
+            base_url=base_url,
+            api_key=api_key,
+            timeout=10.0,
+            max_concurrency=max_concurrency,
+            headers={"x-apikey": api_key},
+        )
 
     async def lookup(self, ioc_type: str, ioc_value: str) -> EnrichmentResult:
         try:
             if ioc_type == "ip":
-                data = await self.get(f"/ip_addresses/{ioc_value}", headers=self._headers())
+                data = await self.get(f"/ip_addresses/{ioc_value}")
                 return self._parse_ip(ioc_value, data)
             elif ioc_type == "domain":
-                data = await self.get(f"/domains/{ioc_value}", headers=self._headers())
+                data = await self.get(f"/domains/{ioc_value}")
                 return self._parse_domain(ioc_value, data)
             elif ioc_type == "hash":
-                data = await self.get(f"/files/{ioc_value}", headers=self._headers())
+                data = await self.get(f"/files/{ioc_value}")
                 return self._parse_file(ioc_value, data)
             else:
                 return EnrichmentResult(
@@ -45,11 +66,7 @@ class VirusTotalProvider(McpHttpClient):
             )
 
     def _parse_ip(self, ioc_value: str, data: dict) -> EnrichmentResult:
-        attrs = data.get("data", {}).get("attributes", {})
-        stats = attrs.get("last_analysis_stats", {})
-        malicious_count = stats.get("malicious", 0)
-        total = sum(stats.values()) or 1
-        score = malicious_count / total
+        attrs, malicious_count, score = _analysis_score(data)
 
         return EnrichmentResult(
             provider="virustotal",
@@ -65,11 +82,7 @@ class VirusTotalProvider(McpHttpClient):
         )
 
     def _parse_domain(self, ioc_value: str, data: dict) -> EnrichmentResult:
-        attrs = data.get("data", {}).get("attributes", {})
-        stats = attrs.get("last_analysis_stats", {})
-        malicious_count = stats.get("malicious", 0)
-        total = sum(stats.values()) or 1
-        score = malicious_count / total
+        attrs, malicious_count, score = _analysis_score(data)
 
         return EnrichmentResult(
             provider="virustotal",
@@ -82,11 +95,7 @@ class VirusTotalProvider(McpHttpClient):
         )
 
     def _parse_file(self, ioc_value: str, data: dict) -> EnrichmentResult:
-        attrs = data.get("data", {}).get("attributes", {})
-        stats = attrs.get("last_analysis_stats", {})
-        malicious_count = stats.get("malicious", 0)
-        total = sum(stats.values()) or 1
-        score = malicious_count / total
+        attrs, malicious_count, score = _analysis_score(data)
 
         return EnrichmentResult(
             provider="virustotal",
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import logging
+import shlex
 import uuid
 from dataclasses import dataclass, field
 
 import asyncssh
+from cachetools import TTLCache
 
 from app.config import settings
 from app.core.db.models import SessionState
@@ -24,8 +27,25 @@ logger = logging.getLogger(__name__)
 SSH_CONNECT_TIMEOUT = 30
 SSH_KEEPALIVE_INTERVAL = 30
 SSH_MAX_OUTPUT_BUFFER = 64 * 1024  # 64 KB
+SSH_PTY_READ_SIZE = 32 * 1024  # one asyncssh receive window's worth per read
 SSH_RECONNECT_MAX_ATTEMPTS = 3
 SSH_RECONNECT_BASE_DELAY = 2  # seconds
+SSH_KEY_CACHE_SIZE = 256
+SSH_KEY_CACHE_TTL = 60  # seconds; decrypted keys must not outlive a connect burst
+
+# Imported keys by digest of the key text, so sessions opened together with one key
+# (e.g. a fleet-wide reconnect) decrypt it only once. Short-lived on purpose: each
+# connection keeps its own key only until close().
+_key_cache: TTLCache[bytes, asyncssh.SSHKey] = TTLCache(maxsize=SSH_KEY_CACHE_SIZE, ttl=SSH_KEY_CACHE_TTL)
+
+
+def _cached_key(key_data: str | bytes) -> asyncssh.SSHKey:
+    raw = key_data.encode() if isinstance(key_data, str) else key_data
+    digest = hashlib.blake2b(raw, digest_size=16).digest()
+    key = _key_cache.get(digest)
+    if key is None:
+        key = _key_cache[digest] = asyncssh.import_private_key(key_data)
+    return key
 
 
 class SshConnectionError(Exception):
@@ -34,12 +54,50 @@ class SshConnectionError(Exception):
 
 import re as _re
 
-_SUDO_PROMPT_RE = _re.compile(r"^\[sudo\] password for \S+:\s*", _re.MULTILINE)
+_SUDO_PROMPT = "[sudo] password for "
+_SUDO_PROMPT_RE = _re.compile(r"\[sudo\] password for \S+:\s*")
+_SUDO_PROMPT_LINE_RE = _re.compile(r"^\[sudo\] password for \S+:\s*", _re.MULTILINE)
 
 
 def _strip_sudo_prompt(stderr: str) -> str:
     """Remove the '[sudo] password for user:' line from stderr."""
-    return _SUDO_PROMPT_RE.sub("", stderr).lstrip("\n")
+    # sudo prints the prompt first, so an anchored match is normally all that's needed
+    m = _SUDO_PROMPT_RE.match(stderr)
+    if m:
+        stderr = stderr[m.end():]
+    # Repeated prompts only appear after a rejected password
+    if _SUDO_PROMPT in stderr:
+        stderr = _SUDO_PROMPT_LINE_RE.sub("", stderr)
+    return stderr.lstrip("\n")
+
+
+class _ShellUnavailable(Exception):
+    """The persistent command shell could not accept a command; nothing was sent."""
+
+
+async def _read_until_sentinel(stream: asyncssh.SSHReader, sentinel: bytes) -> tuple[bytes, bytes]:
+    """
+    Read raw chunks until `sentinel` and the rest of its line arrive.
+    Returns (output before the sentinel, remainder of the sentinel line).
+    Scans the accumulator with bytearray.find, resuming just before the
+    previous tail so a sentinel split across chunks is still found.
+    """
+    acc = bytearray()
+    start = 0
+    while (idx := acc.find(sentinel, start)) < 0:
+        start = max(0, len(acc) - len(sentinel) + 1)
+        chunk = await stream.read(SSH_PTY_READ_SIZE)
+        if not chunk:
+            raise asyncio.IncompleteReadError(bytes(acc), None)
+        acc += chunk
+
+    tail = idx + len(sentinel)
+    while (nl := acc.find(b"\n", tail)) < 0:
+        chunk = await stream.read(SSH_PTY_READ_SIZE)
+        if not chunk:
+            raise asyncio.IncompleteReadError(bytes(acc), None)
+        acc += chunk
+    return bytes(acc[:idx]), bytes(acc[tail:nl])
 
 
 @dataclass
@@ -62,6 +120,8 @@ class SshConnection:
     _credentials: dict = field(default_factory=dict, repr=False, compare=False)
     _reconnect_task: asyncio.Task | None = field(default=None, repr=False, compare=False)
     _closed: bool = field(default=False, repr=False, compare=False)
+    _cmd_shell: asyncssh.SSHClientProcess | None = field(default=None, repr=False, compare=False)
+    _connect_kwargs: dict = field(default_factory=dict, repr=False, compare=False)
 
     async def connect(self, credentials: dict) -> None:
         self._credentials = credentials
@@ -78,10 +138,13 @@ class SshConnection:
         }
 
         if "ssh_key" in credentials:
-            connect_kwargs["client_keys"] = [asyncssh.import_private_key(credentials["ssh_key"])]
+            connect_kwargs["client_keys"] = [_cached_key(credentials["ssh_key"])]
         elif "ssh_password" in credentials:
             connect_kwargs["password"] = credentials["ssh_password"]
 
+        # Kept for reconnects so the private key is only parsed/decrypted once
+        self._connect_kwargs = connect_kwargs
+
         try:
             self._conn = await asyncssh.connect(**connect_kwargs)
             fingerprint = self._get_fingerprint()
@@ -132,21 +195,34 @@ class SshConnection:
         if self._conn is None:
             raise SshConnectionError("Not connected")
 
+        if sudo_password is None:
+            try:
+                return await self._run_in_shell(command, timeout)
+            except _ShellUnavailable as exc:
+                # Nothing was sent, so running it on a one-off channel cannot repeat it
+                logger.debug("Command shell unusable for session %s: %s", self.session_id, exc)
+                self._drop_cmd_shell()
+            except asyncio.TimeoutError:
+                self._drop_cmd_shell()
+                return "", f"Command timed out after {timeout}s", -1
+            except asyncssh.DisconnectError as exc:
+                self._drop_cmd_shell()
+                raise SshConnectionError(str(exc)) from exc
+            except (asyncssh.Error, asyncio.IncompleteReadError, OSError, ValueError) as exc:
+                # The command was already sent and may have run; don't run it again
+                self._drop_cmd_shell()
+                return "", f"Command shell failed: {exc}", -1
+
         try:
-            if sudo_password is not None:
-                result = await asyncio.wait_for(
-                    self._conn.run(
+            async with asyncio.timeout(timeout):
+                if sudo_password is not None:
+                    result = await self._conn.run(
                         command,
                         check=False,
                         input=sudo_password + "\n",
-                    ),
-                    timeout=timeout,
-                )
-            else:
-                result = await asyncio.wait_for(
-                    self._conn.run(command, check=False),
-                    timeout=timeout,
-                )
+                    )
+                else:
+                    result = await self._conn.run(command, check=False)
             stdout = result.stdout or ""
             stderr = result.stderr or ""
             exit_code = result.returncode or 0
@@ -160,6 +236,48 @@ class SshConnection:
         except asyncssh.DisconnectError as exc:
             raise SshConnectionError(str(exc)) from exc
 
+    async def _run_in_shell(self, command: str, timeout: int) -> tuple[str, str, int]:
+        """
+        Run a command on a long-lived shell channel instead of opening a channel per command.
+        The command is passed quoted to a child `$SHELL -c` (as sshd would run it for
+        conn.run) with stdin from /dev/null, so syntax errors fail fast and cwd/env
+        changes, `exit` or stdin reads cannot affect later commands; per-call sentinels
+        delimit the output. Callers serialise access through the session command lock.
+        Raises _ShellUnavailable if the command could not be sent.
+        """
+        try:
+            if self._cmd_shell is None:
+                # Plain non-login sh: no profile output ahead of the first command
+                self._cmd_shell = await self._conn.create_process("exec sh", encoding=None)
+            shell = self._cmd_shell
+            if shell.exit_status is not None or shell.stdout.at_eof():
+                raise _ShellUnavailable("shell exited")
+
+            end = f"__DH_END_{uuid.uuid4().hex}__"
+            shell.stdin.write(
+                f'"${{SHELL:-sh}}" -c {shlex.quote(command)} </dev/null\n'
+                f"printf '\\n{end} %d\\n' $?\n"
+                f"printf '\\n{end}\\n' >&2\n".encode()
+            )
+        except (asyncssh.Error, OSError) as exc:
+            raise _ShellUnavailable(str(exc)) from exc
+
+        sentinel = f"\n{end}".encode()
+        async with asyncio.timeout(timeout):
+            (out, status), (err, _) = await asyncio.gather(
+                _read_until_sentinel(shell.stdout, sentinel),
+                _read_until_sentinel(shell.stderr, sentinel),
+            )
+        return out.decode(errors="replace"), err.decode(errors="replace"), int(status)
+
+    def _drop_cmd_shell(self) -> None:
+        if self._cmd_shell is not None:
+            try:
+                self._cmd_shell.close()
+            except Exception:
+                pass
+            self._cmd_shell = None
+
     async def open_pty(
         self,
         cols: int = 80,
@@ -186,29 +304,31 @@ class SshConnection:
         return process
 
     async def _read_pty(self, callback) -> None:
-        """Background task to read PTY output and invoke callback."""
+        """
+        Background task to read PTY output and invoke callback.
+        open_pty() creates the channel with encoding=None, so reads always yield bytes.
+        """
         if self._pty_channel is None:
             return
         try:
             while True:
-                chunk = await self._pty_channel.stdout.read(1024)
+                chunk = await self._pty_channel.stdout.read(SSH_PTY_READ_SIZE)
                 if not chunk:
                     break
-                if isinstance(chunk, str):
-                    chunk = chunk.encode()
-                # Rolling buffer
+                # Rolling buffer; deleting a bytearray prefix just advances its start
+                # pointer, so this trims without reallocating or copying 64 KB
                 self._output_buffer.extend(chunk)
-                if len(self._output_buffer) > SSH_MAX_OUTPUT_BUFFER:
-                    self._output_buffer = self._output_buffer[-SSH_MAX_OUTPUT_BUFFER:]
+                overflow = len(self._output_buffer) - SSH_MAX_OUTPUT_BUFFER
+                if overflow > 0:
+                    del self._output_buffer[:overflow]
                 await callback(chunk)
         except asyncssh.DisconnectError:
             pass
 
     async def write_pty(self, data: bytes) -> None:
+        """Write raw bytes to the PTY; the channel is binary, so callers encode text first."""
         if self._pty_channel is None:
             raise RuntimeError("No PTY channel open")
-        if isinstance(data, str):
-            data = data.encode()
         self._pty_channel.stdin.write(data)
 
     async def resize_pty(self, cols: int, rows: int) -> None:
@@ -227,6 +347,8 @@ class SshConnection:
         if self._reconnect_task is not None:
             self._reconnect_task.cancel()
             self._reconnect_task = None
+        self._connect_kwargs = {}  # drop the decrypted key and password
+        self._drop_cmd_shell()
         if self._pty_channel is not None:
             try:
                 self._pty_channel.close()
@@ -250,6 +372,7 @@ class SshConnection:
             return
 
         await emit_event(SshDisconnected(session_id=self.session_id, reason="connection lost"))
+        self._cmd_shell = None  # belonged to the dead connection
 
         try:
             await session_manager.transition(
@@ -275,16 +398,7 @@ class SshConnection:
                     self.session_id, SessionState.CONNECTING.value, reason="reconnecting"
                 )
 
-                self._conn = await asyncssh.connect(
-                    host=self.host,
-                    port=self.port,
-                    username=self._credentials.get("username", self.username),
-                    connect_timeout=SSH_CONNECT_TIMEOUT,
-                    keepalive_interval=SSH_KEEPALIVE_INTERVAL,
-                    known_hosts=None,
-                    **({"client_keys": [asyncssh.import_private_key(self._credentials["ssh_key"])]} if "ssh_key" in self._credentials else {}),
-                    **({"password": self._credentials["ssh_password"]} if "ssh_password" in self._credentials else {}),
-                )
+                self._conn = await asyncssh.connect(**self._connect_kwargs)
 
                 fingerprint = self._get_fingerprint()
                 await session_manager.transition(
@@ -318,12 +432,15 @@ class SshConnection:
             return
 
         async def _monitor():
-            while not self._closed:
-                await asyncio.sleep(5)
-                if self._conn is not None and self._conn.is_closed() and not self._closed:
-                    logger.warning("SSH connection lost detected for session %s", self.session_id)
-                    await self._handle_disconnect()
-                    break  # Reconnect handles its own lifecycle
+            # Sleeps on asyncssh's close event rather than polling is_closed()
+            while not self._closed and (conn := self._conn) is not None:
+                await conn.wait_closed()
+                if self._closed:
+                    break
+                logger.warning("SSH connection lost detected for session %s", self.session_id)
+                await self._handle_disconnect()
+                if self._conn is conn:
+                    break  # reconnect failed; session is already FAILED
 
         self._reconnect_task = asyncio.create_task(_monitor(), name=f"ssh-monitor-{self.session_id}")
 
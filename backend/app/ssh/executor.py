@@ -18,6 +18,8 @@ from .engine import SshConnection, SshConnectionError
 
 logger = logging.getLogger(__name__)
 
+OUTPUT_CHUNK_SIZE = 4096  # chars per ssh.command_output event
+
 
 class CommandBlockedError(Exception):
     """Raised when a command is blocked by the safety classifier."""
@@ -60,7 +62,7 @@ async def execute_command(
     if ctx.mode == "interactive":
         raise RuntimeError("Cannot execute AI commands while in interactive (PTY) mode")
 
-    async with ctx.command_lock:
+    async with ctx.guard("command"):
         conn: SshConnection = ctx.ssh_connection
         if conn is None or not conn.is_connected:
             raise SshConnectionError("SSH not connected")
@@ -84,28 +86,25 @@ async def execute_command(
 
         duration_ms = int((datetime.now(timezone.utc) - started_at).total_seconds() * 1000)
 
-        # Emit output events (chunked for large outputs)
-        if stdout:
-            for chunk in _chunk_string(stdout, 4096):
+        # Emit output events (chunked for large outputs). The two streams are sent
+        # concurrently; chunks within a stream stay in order.
+        async def _emit_stream(stream: str, text: str) -> None:
+            for i in range(0, len(text), OUTPUT_CHUNK_SIZE):
                 await emit_event(
                     SshCommandOutput(
                         session_id=session_id,
                         command_id=command_id,
-                        chunk=chunk,
-                        stream="stdout",
+                        chunk=text[i:i + OUTPUT_CHUNK_SIZE],
+                        stream=stream,
                     )
                 )
 
-        if stderr:
-            for chunk in _chunk_string(stderr, 4096):
-                await emit_event(
-                    SshCommandOutput(
-                        session_id=session_id,
-                        command_id=command_id,
-                        chunk=chunk,
-                        stream="stderr",
-                    )
-                )
+        if stdout and stderr:
+            await asyncio.gather(_emit_stream("stdout", stdout), _emit_stream("stderr", stderr))
+        elif stdout:
+            await _emit_stream("stdout", stdout)
+        elif stderr:
+            await _emit_stream("stderr", stderr)
 
         await emit_event(
             SshCommandCompleted(
@@ -117,8 +116,3 @@ async def execute_command(
         )
 
         return stdout, stderr, exit_code
-
-
-def _chunk_string(s: str, size: int):
-    for i in range(0, len(s), size):
-        yield s[i:i + size]
@@ -7,6 +7,20 @@ from .executor import execute_command
 
 logger = logging.getLogger(__name__)
 
+_DETECT_MARKER = "__DARKHOUND_OS_DETECT__"
+_DETECT_COMMAND = (
+    f"uname -a; echo {_DETECT_MARKER}; uname -m; echo {_DETECT_MARKER}; uname -r; "
+    f"echo {_DETECT_MARKER}; cat /etc/os-release 2>/dev/null"
+)
+
+# KEY=value, KEY="value" (backslash escapes allowed) or KEY='value' per line of /etc/os-release
+_OS_RELEASE_RE = re.compile(
+    r"""^[ \t]*([A-Za-z_][A-Za-z0-9_]*)="""
+    r"""(?:"((?:[^"\\\r\n]|\\.)*)"|'([^'\r\n]*)'|([^\r\n]*?))[ \t]*\r?$""",
+    re.MULTILINE,
+)
+_OS_RELEASE_ESCAPE_RE = re.compile(r"\\(.)")
+
 
 async def detect_os(session_id: str) -> dict:
     """
@@ -19,54 +33,42 @@ async def detect_os(session_id: str) -> dict:
         "platform_metadata": {},
     }
 
-    # Step 1: uname
+    # Single round trip: uname -a, arch, kernel and os-release separated by a marker line
     try:
-        stdout, _, exit_code = await execute_command(session_id, "uname -a", timeout=10)
-        if exit_code == 0 and stdout:
-            result["platform_metadata"]["uname"] = stdout.strip()
-            uname_lower = stdout.lower()
-
-            if "linux" in uname_lower:
-                result["os_type"] = "linux"
-            elif "darwin" in uname_lower:
-                result["os_type"] = "macos"
-            elif "freebsd" in uname_lower or "bsd" in uname_lower:
-                result["os_type"] = "linux"  # treat as linux-like
-
+        stdout, _, _ = await execute_command(session_id, _DETECT_COMMAND, timeout=15)
     except Exception as exc:
-        logger.warning("OS detect uname failed: %s", exc)
-
-    # Step 2: /etc/os-release (Linux only)
-    if result["os_type"] == "linux":
-        try:
-            stdout, _, exit_code = await execute_command(
-                session_id, "cat /etc/os-release 2>/dev/null", timeout=10
-            )
-            if exit_code == 0 and stdout:
-                parsed = _parse_os_release(stdout)
-                result["platform_metadata"].update(parsed)
-                if "PRETTY_NAME" in parsed:
-                    result["os_version"] = parsed["PRETTY_NAME"]
-                elif "VERSION_ID" in parsed:
-                    result["os_version"] = f"{parsed.get('ID', 'linux')} {parsed['VERSION_ID']}"
-        except Exception as exc:
-            logger.warning("OS detect /etc/os-release failed: %s", exc)
-
-    # Step 3: architecture
-    try:
-        stdout, _, _ = await execute_command(session_id, "uname -m", timeout=5)
-        if stdout.strip():
-            result["platform_metadata"]["arch"] = stdout.strip()
-    except Exception:
-        pass
+        logger.warning("OS detect failed: %s", exc)
+        stdout = ""
 
-    # Step 4: kernel version
-    try:
-        stdout, _, _ = await execute_command(session_id, "uname -r", timeout=5)
-        if stdout.strip():
-            result["platform_metadata"]["kernel"] = stdout.strip()
-    except Exception:
-        pass
+    parts = [p.strip() for p in stdout.split(_DETECT_MARKER)]
+    uname_a, arch, kernel, os_release = (parts + [""] * 4)[:4]
+
+    # uname
+    if uname_a:
+        result["platform_metadata"]["uname"] = uname_a
+        uname_lower = uname_a.lower()
+
+        if "linux" in uname_lower:
+            result["os_type"] = "linux"
+        elif "darwin" in uname_lower:
+            result["os_type"] = "macos"
+        elif "freebsd" in uname_lower or "bsd" in uname_lower:
+            result["os_type"] = "linux"  # treat as linux-like
+
+    # /etc/os-release (Linux only)
+    if result["os_type"] == "linux" and os_release:
+        parsed = _parse_os_release(os_release)
+        result["platform_metadata"].update(parsed)
+        if "PRETTY_NAME" in parsed:
+            result["os_version"] = parsed["PRETTY_NAME"]
+        elif "VERSION_ID" in parsed:
+            result["os_version"] = f"{parsed.get('ID', 'linux')} {parsed['VERSION_ID']}"
+
+    # architecture / kernel version
+    if arch:
+        result["platform_metadata"]["arch"] = arch
+    if kernel:
+        result["platform_metadata"]["kernel"] = kernel
 
     logger.info("OS detected for session %s: %s %s", session_id, result["os_type"], result["os_version"])
     return result
@@ -75,10 +77,9 @@ async def detect_os(session_id: str) -> dict:
 def _parse_os_release(content: str) -> dict:
     """Parse /etc/os-release key=value pairs."""
     data = {}
-    for line in content.splitlines():
-        line = line.strip()
-        if "=" not in line or line.startswith("#"):
-            continue
-        key, _, value = line.partition("=")
-        data[key.strip()] = value.strip().strip('"')
+    for key, double_quoted, single_quoted, bare in _OS_RELEASE_RE.findall(content):
+        if double_quoted:
+            data[key] = _OS_RELEASE_ESCAPE_RE.sub(r"\1", double_quoted)
+        else:
+            data[key] = single_quoted or bare.strip('"')
     return data
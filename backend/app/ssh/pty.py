@@ -1,9 +1,8 @@
 from __future__ import annotations
 
 import asyncio
-import base64
 import logging
-import time
+from collections.abc import Callable
 
 from app.core.events.emitter import emit_event
 from app.core.events.schema import TerminalClosed, TerminalData, TerminalStarted
@@ -15,6 +14,14 @@ logger = logging.getLogger(__name__)
 PTY_MAX_EVENTS_PER_SECOND = 60
 PTY_COALESCE_INTERVAL = 1.0 / PTY_MAX_EVENTS_PER_SECOND  # ~16ms
 PTY_MAX_COALESCE_BUFFER = 8192  # Max bytes to coalesce before forced flush
+PTY_INPUT_QUEUE_SIZE = 256  # pending input frames before the oldest is dropped
+PTY_INPUT_MAX_BATCH = 16  # input frames joined into one channel write
+PTY_CLOSE_TIMEOUT = 5.0  # seconds to let the PTY task wind down before cancelling it
+PTY_MAX_PENDING_STARTS = 64  # PTY channels being opened at once, across all sessions
+PTY_START_WAIT = 0.1  # seconds to wait for a start slot before reporting busy
+
+# Held from spawn until the PTY channel is open (or failed to open)
+_start_slots = asyncio.Semaphore(PTY_MAX_PENDING_STARTS)
 
 
 class PtyRateLimiter:
@@ -25,56 +32,128 @@ class PtyRateLimiter:
 
     def __init__(self, session_id: str) -> None:
         self._session_id = session_id
-        self._buffer = bytearray()
+        # Fixed-size coalesce buffer; _size marks the filled prefix so nothing is reallocated
+        self._buffer = bytearray(PTY_MAX_COALESCE_BUFFER * 2)
+        self._size = 0
+        # Constructed inside the PTY session coroutine, so a running loop exists. Its clock
+        # is monotonic, and under uvloop it is the tick-cached time rather than a syscall.
+        self._loop = asyncio.get_running_loop()
         self._last_flush = 0.0
         self._lock = asyncio.Lock()
+        self._timer: asyncio.TimerHandle | None = None  # pending deferred flush
         self._flush_task: asyncio.Task | None = None
         self._closed = False
 
     async def write(self, raw_bytes: bytes) -> None:
         async with self._lock:
-            self._buffer.extend(raw_bytes)
+            n = len(raw_bytes)
+            if self._size + n > len(self._buffer):
+                await self._flush()
+            if n > len(self._buffer):
+                # Larger than the whole buffer: send as-is
+                self._last_flush = self._loop.time()
+                await self._emit(raw_bytes)
+                return
+            self._buffer[self._size:self._size + n] = raw_bytes
+            self._size += n
 
-            now = time.monotonic()
+            now = self._loop.time()
             elapsed = now - self._last_flush
 
             # Flush immediately if enough time has passed or buffer is large
-            if elapsed >= PTY_COALESCE_INTERVAL or len(self._buffer) >= PTY_MAX_COALESCE_BUFFER:
+            if elapsed >= PTY_COALESCE_INTERVAL or self._size >= PTY_MAX_COALESCE_BUFFER:
                 await self._flush()
-            elif self._flush_task is None or self._flush_task.done():
-                # Schedule a deferred flush
-                self._flush_task = asyncio.create_task(self._deferred_flush())
+            elif self._timer is None:
+                # Schedule a deferred flush; a timer handle is far cheaper than a sleeping Task
+                self._timer = self._loop.call_later(
+                    PTY_COALESCE_INTERVAL, self._on_timer,
+                )
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        if not self._closed:
+            self._flush_task = asyncio.create_task(self._deferred_flush())
 
     async def _deferred_flush(self) -> None:
-        await asyncio.sleep(PTY_COALESCE_INTERVAL)
         async with self._lock:
-            if self._buffer and not self._closed:
+            if self._size and not self._closed:
                 await self._flush()
 
     async def _flush(self) -> None:
-        if not self._buffer:
+        if not self._size:
             return
-        data = bytes(self._buffer)
-        self._buffer.clear()
-        self._last_flush = time.monotonic()
+        # Snapshot the filled prefix; the buffer is reused as soon as we yield
+        data = bytes(memoryview(self._buffer)[:self._size])
+        self._size = 0
+        self._last_flush = self._loop.time()
+        await self._emit(data)
 
-        encoded = base64.b64encode(data).decode()
-        await emit_event(TerminalData(session_id=self._session_id, data=encoded))
+    async def _emit(self, data: bytes) -> None:
+        await emit_event(TerminalData(session_id=self._session_id, data=data))
 
     async def close(self) -> None:
         self._closed = True
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
         async with self._lock:
-            if self._buffer:
+            if self._size:
                 await self._flush()
         if self._flush_task and not self._flush_task.done():
             self._flush_task.cancel()
 
 
-async def start_pty_session(session_id: str, cols: int = 80, rows: int = 24) -> None:
+class PtyInputWriter:
+    """
+    Queues browser input for the PTY and drains it from one writer task,
+    joining whatever has queued up into a single channel write.
+    """
+
+    def __init__(self, session_id: str, ssh_connection) -> None:
+        self._session_id = session_id
+        # Bound once: the writer lives exactly as long as the PTY channel it feeds
+        self._write_pty = ssh_connection.write_pty
+        self._queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=PTY_INPUT_QUEUE_SIZE)
+        self._task = asyncio.create_task(self._run(), name=f"pty-input-{session_id}")
+
+    def put(self, data: bytes) -> None:
+        """Queue input without blocking the handler; drops the oldest frame when full."""
+        try:
+            self._queue.put_nowait(data)
+        except asyncio.QueueFull:
+            self._queue.get_nowait()
+            self._queue.put_nowait(data)
+            logger.warning("PTY input queue full, dropped oldest frame: session=%s", self._session_id)
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < PTY_INPUT_MAX_BATCH and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._write_pty(b"".join(batch))
+            except Exception as exc:
+                logger.error("PTY write error session=%s: %s", self._session_id, exc)
+
+    async def close(self) -> None:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+async def start_pty_session(
+    session_id: str,
+    cols: int = 80,
+    rows: int = 24,
+    on_started: Callable[[], None] | None = None,
+) -> None:
     """
     Open an interactive PTY channel on the session's SSH connection.
     Switches session mode to 'interactive'.
     Emits terminal.started and streams terminal.data events.
+    on_started is called once the channel is open.
     """
     ctx = session_manager.get(session_id)
     if ctx is None:
@@ -84,7 +163,7 @@ async def start_pty_session(session_id: str, cols: int = 80, rows: int = 24) ->
         raise RuntimeError("SSH not connected")
 
     # Mode mutex: block if AI command is in flight
-    async with ctx.mode_mutex:
+    async with ctx.guard("mode"):
         ctx.mode = "interactive"
         logger.info("PTY session starting: session=%s cols=%d rows=%d", session_id, cols, rows)
 
@@ -99,23 +178,79 @@ async def start_pty_session(session_id: str, cols: int = 80, rows: int = 24) ->
                 rows=rows,
                 data_callback=on_data,
             )
+            if on_started is not None:
+                on_started()
+            ctx.pty_input = PtyInputWriter(session_id, ctx.ssh_connection)
             await emit_event(TerminalStarted(session_id=session_id, cols=cols, rows=rows))
 
             # Wait for PTY to close
             await process.wait_closed()
 
         finally:
+            if ctx.pty_input is not None:
+                await ctx.pty_input.close()
+                ctx.pty_input = None
             await rate_limiter.close()
             ctx.mode = "ai"
             await emit_event(TerminalClosed(session_id=session_id, reason="pty closed"))
             logger.info("PTY session ended: session=%s", session_id)
 
 
+async def spawn_pty_session(session_id: str) -> bool:
+    """
+    Run start_pty_session in the background, tracked on the session context.
+    Returns False without starting anything when too many PTYs are already opening.
+    """
+    ctx = session_manager.get(session_id)
+    if ctx is None:
+        raise KeyError(f"Session {session_id} not found")
+
+    try:
+        async with asyncio.timeout(PTY_START_WAIT):
+            await _start_slots.acquire()
+    except TimeoutError:
+        logger.warning("PTY start rejected, too many pending: session=%s", session_id)
+        return False
+
+    released = False
+
+    def _release() -> None:
+        nonlocal released
+        if not released:
+            released = True
+            _start_slots.release()
+
+    task = asyncio.get_running_loop().create_task(
+        start_pty_session(session_id, on_started=_release), name=f"pty-{session_id}",
+    )
+    ctx.pty_task = task
+
+    def _done(t: asyncio.Task) -> None:
+        _release()
+        if ctx.pty_task is t:
+            ctx.pty_task = None
+        if not t.cancelled() and t.exception() is not None:
+            logger.error("PTY session failed: session=%s error=%s", session_id, t.exception())
+
+    task.add_done_callback(_done)
+    return True
+
+
 async def close_pty_session(session_id: str, reason: str = "analyst request") -> None:
     ctx = session_manager.get(session_id)
     if ctx is None:
         return
     if ctx.ssh_connection is not None:
         await ctx.ssh_connection.close_pty(reason)
+
+    # Closing the channel ends the PTY task; give its cleanup a bounded time to run
+    task = ctx.pty_task
+    if task is not None and task is not asyncio.current_task():
+        _, pending = await asyncio.wait({task}, timeout=PTY_CLOSE_TIMEOUT)
+        if pending:
+            task.cancel()
+            # The channel may have opened after the close above (PTY was still starting)
+            if ctx.ssh_connection is not None:
+                await ctx.ssh_connection.close_pty(reason)
     ctx.mode = "ai"
     await emit_event(TerminalClosed(session_id=session_id, reason=reason))
@@ -1,14 +1,78 @@
 from __future__ import annotations
 
+import asyncio
+import itertools
 import logging
+from base64 import b64decode as _b64decode
+from dataclasses import dataclass
+from urllib.parse import parse_qs
 
 from .socketio import sio
 from app.core.session import session_manager
 from app.core.events.emitter import emit_event
-from app.core.events.schema import TerminalResize, SystemError
+from app.core.security.auth import verify_access_token_cached
+from app.core.events.schema import SessionModeChanged, TerminalResize, SystemError
+from app.ssh.pty import close_pty_session, spawn_pty_session
 
 logger = logging.getLogger(__name__)
 
+# Window drags emit a resize per frame; only the last size within this window is applied
+RESIZE_DEBOUNCE = 0.05  # seconds
+# Our access tokens are a few hundred bytes; anything far larger is rejected unverified
+MAX_TOKEN_LENGTH = 4096
+# Per-connection lifecycle logs are DEBUG; INFO gets a running total every this many connects
+CONNECT_LOG_EVERY = 1024
+
+_connects = itertools.count(1)
+
+
+@dataclass(slots=True)
+class SidState:
+    """Identity of an authenticated Socket.IO connection."""
+    user: str
+    role: str | None
+
+
+# sid -> SidState, filled on connect and dropped on disconnect. Kept here rather than in
+# sio.save_session, whose per-sid dict lives inside the engine.io session and costs an await.
+_sids: dict[str, SidState] = {}
+
+
+def _authorize(sid: str, session_id: str | None):
+    """
+    Resolve the session context for `sid`, allowing only the session owner or an admin.
+    Returns the SessionContext, or an {"error": ...} dict for the ack.
+    Never awaits, so rejected events cost no event-loop yield.
+    """
+    if not session_id or not isinstance(session_id, str):
+        return {"error": "session_id required"}
+
+    ctx = session_manager.get(session_id)
+    if ctx is None:
+        return {"error": f"Session {session_id} not found"}
+
+    state = _sids.get(sid)
+    if state is None or (ctx.analyst_id != state.user and state.role != "admin"):
+        return {"error": "Not authorized"}
+    return ctx
+
+
+def _joined(sid: str, session_id: str | None):
+    """
+    Fast path for per-keystroke events: only sids that passed _authorize in
+    join_session are in the session room, so membership is the ACL.
+    Returns the SessionContext, or None.
+
+    Terminal and control events deliberately share the default namespace: rooms
+    are already per session, so a separate /terminal namespace would not shrink
+    this lookup, and it would need its own auth, join and client socket.
+    """
+    if not isinstance(session_id, str):
+        return None
+    if sid not in sio.manager.rooms.get("/", {}).get(session_id, ()):
+        return None
+    return session_manager.get(session_id)
+
 
 @sio.event
 async def connect(sid: str, environ: dict, auth: dict | None = None) -> bool:
@@ -21,21 +85,26 @@ async def connect(sid: str, environ: dict, auth: dict | None = None) -> bool:
         token = auth.get("token")
     if not token:
         # Try query string
-        query = environ.get("QUERY_STRING", "")
-        for part in query.split("&"):
-            if part.startswith("token="):
-                token = part[6:]
-                break
+        try:
+            qs = parse_qs(environ.get("QUERY_STRING", ""), max_num_fields=16)
+        except ValueError:  # more fields than max_num_fields
+            qs = {}
+        token = (qs.get("token") or [None])[0]
 
     if not token:
         logger.warning("Socket.IO connection rejected — no token (sid=%s)", sid)
         return False
+    if len(token) > MAX_TOKEN_LENGTH:
+        logger.warning("Socket.IO connection rejected — oversized token (sid=%s)", sid)
+        return False
 
     try:
-        from app.core.security.auth import verify_access_token
-        payload = verify_access_token(token)
-        await sio.save_session(sid, {"user": payload["sub"], "role": payload.get("role")})
-        logger.info("Socket.IO connected: sid=%s user=%s", sid, payload["sub"])
+        payload = verify_access_token_cached(token)
+        _sids[sid] = SidState(user=payload["sub"], role=payload.get("role"))
+        logger.debug("Socket.IO connected: sid=%s user=%s", sid, payload["sub"])
+        n = next(_connects)
+        if n % CONNECT_LOG_EVERY == 0:
+            logger.info("Socket.IO: %d connections accepted, %d open", n, len(_sids))
         return True
     except ValueError as exc:
         logger.warning("Socket.IO auth failed: %s (sid=%s)", exc, sid)
@@ -44,31 +113,21 @@ async def connect(sid: str, environ: dict, auth: dict | None = None) -> bool:
 
 @sio.event
 async def disconnect(sid: str) -> None:
-    logger.info("Socket.IO disconnected: sid=%s", sid)
+    _sids.pop(sid, None)
+    logger.debug("Socket.IO disconnected: sid=%s", sid)
 
 
 @sio.event
 async def join_session(sid: str, data: dict) -> dict:
     """Join a session room to receive session-scoped events."""
     session_id = data.get("session_id")
-    if not session_id:
-        return {"error": "session_id required"}
-
-    ctx = session_manager.get(session_id)
-    if ctx is None:
-        return {"error": f"Session {session_id} not found"}
-
-    sio_session = await sio.get_session(sid)
-    analyst_id = sio_session.get("user")
-
     # Only the session owner or admin can join
-    if ctx.analyst_id != analyst_id:
-        role = sio_session.get("role")
-        if role != "admin":
-            return {"error": "Not authorized to join this session"}
+    ctx = _authorize(sid, session_id)
+    if isinstance(ctx, dict):
+        return ctx
 
     await sio.enter_room(sid, session_id)
-    logger.info("sid=%s joined room=%s", sid, session_id)
+    logger.debug("sid=%s joined room=%s", sid, session_id)
     return {"ok": True, "session_id": session_id}
 
 
@@ -89,88 +148,95 @@ async def toggle_mode(sid: str, data: dict) -> dict:
     session_id = data.get("session_id")
     mode = data.get("mode", "ai")
 
-    if not session_id:
-        return {"error": "session_id required"}
+    ctx = _authorize(sid, session_id)
+    if isinstance(ctx, dict):
+        return ctx
 
-    ctx = session_manager.get(session_id)
-    if ctx is None:
-        return {"error": f"Session {session_id} not found"}
+    # Serialise toggles so repeated requests cannot race a PTY that is still starting.
+    # SessionModeChanged is emitted even when the toggling analyst is alone in the room
+    # (unlike TerminalResize): the client ignores this ack and takes its mode from the event.
+    async with ctx.guard("toggle"):
+        pty_running = ctx.mode == "interactive" or ctx.pty_task is not None
 
-    sio_session = await sio.get_session(sid)
-    analyst_id = sio_session.get("user")
-    if ctx.analyst_id != analyst_id:
-        role = sio_session.get("role")
-        if role != "admin":
-            return {"error": "Not authorized"}
-
-    if mode == "interactive" and ctx.mode != "interactive":
-        # Start PTY session as background task
-        import asyncio
-        from app.ssh.pty import start_pty_session
-        asyncio.create_task(
-            start_pty_session(session_id),
-            name=f"pty-{session_id}",
-        )
-        from app.core.events.schema import SessionModeChanged
-        await emit_event(SessionModeChanged(session_id=session_id, from_mode="ai", to_mode="interactive"))
-        return {"ok": True, "mode": "interactive"}
-
-    elif mode == "ai" and ctx.mode != "ai":
-        from app.ssh.pty import close_pty_session
-        await close_pty_session(session_id, reason="analyst toggled to AI mode")
-        from app.core.events.schema import SessionModeChanged
-        await emit_event(SessionModeChanged(session_id=session_id, from_mode="interactive", to_mode="ai"))
-        return {"ok": True, "mode": "ai"}
-
-    return {"ok": True, "mode": ctx.mode}
+        if mode == "interactive" and not pty_running:
+            # Start PTY session as background task
+            if not await spawn_pty_session(session_id):
+                return {"error": "busy"}
+            await emit_event(SessionModeChanged(session_id=session_id, from_mode="ai", to_mode="interactive"))
+            return {"ok": True, "mode": "interactive"}
+
+        elif mode == "ai" and pty_running:
+            await close_pty_session(session_id, reason="analyst toggled to AI mode")
+            await emit_event(SessionModeChanged(session_id=session_id, from_mode="interactive", to_mode="ai"))
+            return {"ok": True, "mode": "ai"}
+
+        return {"ok": True, "mode": "interactive" if pty_running else ctx.mode}
 
 
 @sio.event
 async def terminal_input(sid: str, data: dict) -> None:
     """
     Forward PTY input from browser to SSH session.
-    data: { session_id, input (base64 or raw str) }
+    data: { session_id, input (binary; legacy clients: base64 str, or raw str with b64=false) }
     """
-    session_id = data.get("session_id")
-    if not session_id:
-        return
-
-    ctx = session_manager.get(session_id)
+    ctx = _joined(sid, data.get("session_id"))
     if ctx is None or ctx.mode != "interactive":
         return
+    writer = ctx.pty_input
+    if writer is None:
+        return
 
-    if ctx.ssh_connection is None:
+    raw = data.get("input")
+    if raw is None:
         return
+    if isinstance(raw, (bytes, bytearray, memoryview)):
+        decoded = raw
+    elif data.get("b64", True):
+        try:
+            decoded = _b64decode(raw)
+        except ValueError:
+            decoded = raw.encode("utf-8", "surrogateescape")
+    else:
+        decoded = raw.encode("utf-8", "surrogateescape")
 
-    raw = data.get("input", "")
-    try:
-        import base64
-        decoded = base64.b64decode(raw)
-    except Exception:
-        decoded = raw.encode() if isinstance(raw, str) else raw
-
-    try:
-        await ctx.ssh_connection.write_pty(decoded)
-    except Exception as exc:
-        logger.error("PTY write error session=%s: %s", session_id, exc)
+    writer.put(decoded)
 
 
 @sio.event
 async def terminal_resize(sid: str, data: dict) -> None:
-    """Handle xterm.js terminal resize."""
-    session_id = data.get("session_id")
+    """Handle xterm.js terminal resize, debounced per session."""
     cols = data.get("cols", 80)
     rows = data.get("rows", 24)
 
-    if not session_id:
+    ctx = _joined(sid, data.get("session_id"))
+    if ctx is None or ctx.ssh_connection is None:
         return
 
-    ctx = session_manager.get(session_id)
-    if ctx is None or ctx.ssh_connection is None:
+    ctx.resize_target = (cols, rows)
+    if ctx.resize_handle is not None:
+        ctx.resize_handle.cancel()
+    ctx.resize_handle = asyncio.get_running_loop().call_later(
+        RESIZE_DEBOUNCE, _on_resize_timer, ctx,
+    )
+
+
+def _on_resize_timer(ctx) -> None:
+    ctx.resize_handle = None
+    asyncio.create_task(_apply_resize(ctx), name=f"pty-resize-{ctx.session_id}")
+
+
+async def _apply_resize(ctx) -> None:
+    """Apply the latest requested size with one window-change and one event."""
+    target, ctx.resize_target = ctx.resize_target, None
+    if target is None or ctx.ssh_connection is None:
         return
 
+    cols, rows = target
     try:
         await ctx.ssh_connection.resize_pty(cols, rows)
-        await emit_event(TerminalResize(session_id=session_id, cols=cols, rows=rows))
+        # The resizing client is in the room and already knows its size; only
+        # other viewers of the session need the event
+        if len(sio.manager.rooms.get("/", {}).get(ctx.session_id, ())) > 1:
+            await emit_event(TerminalResize(session_id=ctx.session_id, cols=cols, rows=rows))
     except Exception as exc:
-        logger.error("PTY resize error session=%s: %s", session_id, exc)
+        logger.error("PTY resize error session=%s: %s", ctx.session_id, exc)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 
+import orjson
 import socketio
 
 from app.config import settings
@@ -9,8 +10,30 @@ from app.core.events.emitter import init_emitter
 
 logger = logging.getLogger(__name__)
 
+# Polling responses are compressed per recipient; only bother for large payloads
+HTTP_COMPRESSION_THRESHOLD = 64 * 1024
+
+
+class _OrJSON:
+    """json-module shim so Socket.IO packets are encoded/decoded with orjson."""
+
+    @staticmethod
+    def dumps(obj, *args, **kwargs) -> str:
+        # python-socketio passes stdlib-only kwargs (e.g. separators); orjson output is already compact
+        return orjson.dumps(obj).decode()
+
+    @staticmethod
+    def loads(s, *args, **kwargs):
+        return orjson.loads(s)
+
+
+# The event loop is chosen by uvicorn before this module is imported: the image runs
+# with --loop uvloop, and the default --loop auto also picks uvloop (installed via
+# uvicorn[standard]). Setting a loop policy here would be too late to take effect.
 sio = socketio.AsyncServer(
     async_mode="asgi",
+    json=_OrJSON,
+    compression_threshold=HTTP_COMPRESSION_THRESHOLD,
     cors_allowed_origins=settings.cors_origin_list or "*",
     logger=False,
     engineio_logger=False,
@@ -15,10 +15,11 @@ export function TerminalPanel({ sessionId, socket, active, jumpStepId, jumpStepO
   const containerRef = useRef<HTMLDivElement>(null);
   const stepMarkersRef = useRef<Map<string, number>>(new Map());
   const { initTerminal, writeData, writeText, getLineIndex, scrollToLine, getDimensions, fit } = useTerminal({
-    onData: (base64Data) => {
+    onData: (bytes) => {
+      // Uint8Array goes out as a Socket.IO binary attachment, no base64
       socket?.emit('terminal_input', {
         session_id: sessionId,
-        input: base64Data,
+        input: bytes,
       });
     },
   });
@@ -33,7 +34,7 @@ export function TerminalPanel({ sessionId, socket, active, jumpStepId, jumpStepO
   useEffect(() => {
     if (!socket) return;
 
-    const handleData = (event: { data: string }) => {
+    const handleData = (event: { data: ArrayBuffer | string }) => {
       writeData(event.data);
     };
 
@@ -81,7 +81,7 @@ export interface TerminalStarted extends BaseEvent {
 export interface TerminalData extends BaseEvent {
   event_type: 'terminal.data';
   session_id: string;
-  data: string; // base64
+  data: ArrayBuffer; // raw ANSI bytes (Socket.IO binary attachment)
 }
 
 export interface TerminalClosed extends BaseEvent {
@@ -4,9 +4,11 @@ import { FitAddon } from '@xterm/addon-fit';
 import { WebLinksAddon } from '@xterm/addon-web-links';
 
 interface UseTerminalOptions {
-  onData?: (data: string) => void; // Called with base64 input to send to server
+  onData?: (data: Uint8Array) => void; // Called with UTF-8 input bytes to send to server
 }
 
+const encoder = new TextEncoder();
+
 export function useTerminal({ onData }: UseTerminalOptions = {}) {
   const termRef = useRef<Terminal | null>(null);
   const fitAddonRef = useRef<FitAddon | null>(null);
@@ -68,8 +70,7 @@ export function useTerminal({ onData }: UseTerminalOptions = {}) {
     // Forward user input via ref so callback never goes stale
     term.onData((data) => {
       if (onDataRef.current) {
-        const encoded = btoa(unescape(encodeURIComponent(data)));
-        onDataRef.current(encoded);
+        onDataRef.current(encoder.encode(data));
       }
     });
 
@@ -81,8 +82,14 @@ export function useTerminal({ onData }: UseTerminalOptions = {}) {
     resizeObserverRef.current.observe(container);
   }, [safeFit]);
 
-  const writeData = useCallback((base64Data: string) => {
+  const writeData = useCallback((data: ArrayBuffer | string) => {
     if (!termRef.current) return;
+    if (typeof data !== 'string') {
+      termRef.current.write(new Uint8Array(data));
+      return;
+    }
+    // Legacy base64 string payload
+    const base64Data = data;
     try {
       const decoded = atob(base64Data);
       const bytes = new Uint8Array(decoded.length);